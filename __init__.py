@@ -13,7 +13,6 @@ Example usage:
     success = downloader.download("https://youtube.com/watch?v=...", config)
 """
 
-from .core import VideoDownloader, ProgressHandler
 from .models import ContentType, QualityPreset, DownloadConfig, PlatformInfo
 from .platforms import AVAILABLE_PLATFORMS
 
@@ -21,6 +20,13 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __description__ = "Multi-platform video downloader"
 
+def __getattr__(name):
+    # The downloader imports yt-dlp, only load it when it is used
+    if name in ('VideoDownloader', 'ProgressHandler'):
+        from . import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'VideoDownloader',
     'ProgressHandler', 
@@ -0,0 +1,11 @@
+"""Offline benchmarks for the media downloader.
+
+Run with ``python -m media_downloader.benchmarks``; see ``--help``.
+"""
+
+from .s3 import FakeS3Client
+from .server import MediaServer
+from .stub import QuietUIManager, StubPlatform
+from .suite import BENCHMARKS, Measurement
+
+__all__ = ['FakeS3Client', 'MediaServer', 'StubPlatform', 'QuietUIManager', 'BENCHMARKS', 'Measurement']
\ No newline at end of file
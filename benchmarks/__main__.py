@@ -0,0 +1,91 @@
+"""Run the benchmarks and compare results between versions."""
+
+import argparse
+import datetime
+import json
+import logging
+import platform
+import sys
+from typing import Dict
+
+from .. import __version__
+from .suite import BENCHMARKS, STARTUP_BUDGET_MS, check_startup
+
+def run(names, quick: bool) -> Dict:
+    """Run the selected benchmarks and build the result document."""
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        for measurement in BENCHMARKS[name](quick):
+            results[measurement.name] = measurement.to_dict()
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "quick": quick,
+        "results": results,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> int:
+    """Print the change of each result against a baseline and count regressions."""
+    regressions = 0
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["value"]:
+            print(f"{name:<36} {'-':>12} {result['value']:>12.2f} {'new':>9}")
+            continue
+        change = (result["value"] - previous["value"]) / previous["value"] * 100
+        worse = -change if result["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<36} {previous['value']:>12.2f} {result['value']:>12.2f} {change:>+8.1f}%{flag}")
+    return regressions
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline media downloader benchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="NAME",
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("-o", "--output", metavar="PATH", help="Write results as JSON to PATH (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=10.0, metavar="PERCENT",
+                        help="Slowdown that counts as a regression (default: 10)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a fast smoke run")
+    parser.add_argument("--check-startup", nargs="?", type=float, const=STARTUP_BUDGET_MS, metavar="MS",
+                        help=f"Only check that short CLI commands avoid heavy imports and start "
+                             f"within budget (default: {STARTUP_BUDGET_MS} ms)")
+    parsed_args = parser.parse_args(args)
+    unknown = [name for name in parsed_args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.CRITICAL)
+    if parsed_args.check_startup is not None:
+        problems = check_startup(parsed_args.check_startup)
+        for problem in problems:
+            print(f"FAIL {problem}")
+        if not problems:
+            print("Start-up within budget")
+        return 1 if problems else 0
+
+    current = run(parsed_args.benchmarks or list(BENCHMARKS), parsed_args.quick)
+
+    document = json.dumps(current, indent=2)
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as f:
+            f.write(document + "\n")
+    elif not parsed_args.compare:
+        print(document)
+
+    if parsed_args.compare:
+        with open(parsed_args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, parsed_args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""In-process stand-in for an S3 client, for exercising ``S3Sink`` offline."""
+
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from ..core.storage import MIN_PART_SIZE
+
+class FakeS3Client:
+    """Keep objects in memory behind the boto3 S3 client calls ``S3Sink`` makes.
+
+    Multipart uploads are checked like S3 does: parts must be numbered from
+    one and all but the last at least ``MIN_PART_SIZE`` bytes. Each part
+    upload sleeps ``latency`` seconds to stand in for the network. Setting
+    ``fail_complete`` makes completing uploads fail, to exercise the abort
+    path. ``uploads`` holds the multipart uploads still open.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_complete: bool = False):
+        self.latency = latency
+        self.fail_complete = fail_complete
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.aborted = 0
+        self.peak_parts_in_flight = 0
+        self._in_flight = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs):
+        with self._lock:
+            self.objects[(Bucket, Key)] = bytes(Body)
+        return {"ETag": hashlib.md5(Body).hexdigest()}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs):
+        with self._lock:
+            self._next_id += 1
+            upload_id = f"upload-{self._next_id}"
+            self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes):
+        with self._lock:
+            self._in_flight += 1
+            self.peak_parts_in_flight = max(self.peak_parts_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                self._parts(UploadId)[PartNumber] = bytes(Body)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return {"ETag": hashlib.md5(Body).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict):
+        if self.fail_complete:
+            raise ConnectionError("Simulated failure completing the upload")
+        with self._lock:
+            stored = self._parts(UploadId)
+            numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+            if numbers != list(range(1, len(stored) + 1)):
+                raise ValueError(f"InvalidPartOrder: {numbers}")
+            if any(len(stored[number]) < MIN_PART_SIZE for number in numbers[:-1]):
+                raise ValueError("EntityTooSmall")
+            self.objects[(Bucket, Key)] = b"".join(stored[number] for number in numbers)
+            del self.uploads[UploadId]
+        return {"Key": Key}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str):
+        with self._lock:
+            self._parts(UploadId)
+            del self.uploads[UploadId]
+            self.aborted += 1
+
+    def _parts(self, upload_id: str) -> Dict[int, bytes]:
+        # Called with the lock held
+        parts: Optional[Dict[int, bytes]] = self.uploads.get(upload_id)
+        if parts is None:
+            raise KeyError(f"NoSuchUpload: {upload_id}")
+        return parts
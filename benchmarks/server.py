@@ -0,0 +1,120 @@
+"""Local HTTP server serving synthetic media for the benchmarks."""
+
+import os
+import re
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+def synthetic_mp4(size: int) -> bytes:
+    """Build a minimal progressive MP4: an ``ftyp`` box followed by ``mdat`` filler."""
+    ftyp = b"isom" + struct.pack(">I", 512) + b"isomiso2mp41"
+    ftyp = struct.pack(">I", 8 + len(ftyp)) + b"ftyp" + ftyp
+    payload = max(size - len(ftyp) - 8, 0)
+    return ftyp + struct.pack(">I", 8 + payload) + b"mdat" + os.urandom(payload)
+
+class MediaServer:
+    """Serve progressive MP4 files and HLS playlists from memory.
+
+    Paths are derived from the requested size so benchmarks can ask for
+    any payload without setup:
+
+    * ``/progressive/<name>-<bytes>.mp4`` - a single MP4 file
+    * ``/hls/<name>-<bytes>-<segments>.m3u8`` - a media playlist whose
+      segments live under ``/hls/<name>-<bytes>-<segments>/<n>.ts``
+    """
+
+    PROGRESSIVE = re.compile(r"^/progressive/[\w.]+-(?P<size>\d+)\.mp4$")
+    PLAYLIST = re.compile(r"^/hls/(?P<key>[\w.]+-(?P<size>\d+)-(?P<segments>\d+))\.m3u8$")
+    SEGMENT = re.compile(r"^/hls/(?P<key>[\w.]+-(?P<size>\d+)-(?P<segments>\d+))/(?P<index>\d+)\.ts$")
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._payloads: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_HEAD(self):
+                server._respond(self, body=False)
+
+            def do_GET(self):
+                server._respond(self, body=True)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="bench-media", daemon=True)
+
+    @property
+    def host(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}"
+
+    def progressive_url(self, name: str, size: int) -> str:
+        return f"{self.base_url}/progressive/{name}-{size}.mp4"
+
+    def hls_url(self, name: str, size: int, segments: int) -> str:
+        return f"{self.base_url}/hls/{name}-{size}-{segments}.m3u8"
+
+    def _payload(self, size: int) -> bytes:
+        with self._lock:
+            if size not in self._payloads:
+                self._payloads[size] = synthetic_mp4(size)
+            return self._payloads[size]
+
+    def _route(self, path: str) -> Tuple[str, bytes]:
+        match = self.PROGRESSIVE.match(path)
+        if match:
+            return "video/mp4", self._payload(int(match["size"]))
+
+        match = self.PLAYLIST.match(path)
+        if match:
+            segments = int(match["segments"])
+            lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:4",
+                     "#EXT-X-MEDIA-SEQUENCE:0", "#EXT-X-PLAYLIST-TYPE:VOD"]
+            for index in range(segments):
+                lines += ["#EXTINF:4.0,", f"{match['key']}/{index}.ts"]
+            lines.append("#EXT-X-ENDLIST")
+            return "application/vnd.apple.mpegurl", ("\n".join(lines) + "\n").encode()
+
+        match = self.SEGMENT.match(path)
+        if match:
+            payload = self._payload(int(match["size"]))
+            segments, index = int(match["segments"]), int(match["index"])
+            step = -(-len(payload) // segments)
+            return "video/mp2t", payload[index * step:(index + 1) * step]
+
+        raise LookupError(path)
+
+    def _respond(self, handler: BaseHTTPRequestHandler, body: bool):
+        try:
+            content_type, data = self._route(handler.path.split("?")[0])
+        except LookupError:
+            handler.send_error(404)
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        if body:
+            try:
+                handler.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,56 @@
+"""Stub platform and UI used to benchmark without the real sites."""
+
+import os
+from typing import Any, Dict
+
+from ..core.base import Platform
+from ..models import ContentType, DownloadConfig, PlatformInfo
+from ..ui.base import UIManager
+
+class StubPlatform(Platform):
+    """Platform pointing at a local :class:`MediaServer`.
+
+    Downloads go through yt-dlp's generic extractor, so the measured path
+    is the same as for real platforms minus the site extraction.
+    """
+
+    def __init__(self, host: str):
+        super().__init__(PlatformInfo(
+            name="Stub",
+            hosts=[host],
+            patterns=[r"/progressive/", r"/hls/"],
+            id_pattern=r"/(?:progressive|hls)/(?P<id>[\w.-]+?)\.(?:mp4|m3u8)$"
+        ))
+
+    def classify_content(self, url: str) -> ContentType:
+        return ContentType.VIDEO
+
+    def get_output_template(self, config: DownloadConfig, content_type: ContentType) -> str:
+        return os.path.join(config.output_dir, "%(id)s.%(ext)s")
+
+    def get_ydl_options(self, config: DownloadConfig, content_type: ContentType) -> Dict[str, Any]:
+        options = super().get_ydl_options(config, content_type)
+        # Synthetic segments are not real MPEG-TS, keep ffmpeg out of the measurement
+        options.update({"format": "best", "fixup": "never", "noprogress": True, "no_warnings": True})
+        return options
+
+class QuietUIManager(UIManager):
+    """UI manager that discards all output."""
+
+    def show_welcome(self):
+        pass
+
+    def get_url_input(self) -> str:
+        return "quit"
+
+    def get_download_config(self) -> DownloadConfig:
+        return DownloadConfig()
+
+    def show_success(self, message: str):
+        pass
+
+    def show_error(self, message: str):
+        pass
+
+    def show_info(self, message: str):
+        pass
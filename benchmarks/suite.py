@@ -0,0 +1,209 @@
+"""Benchmark cases for the media downloader."""
+
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from ..core import ProgressHandler, S3Sink, VideoDownloader
+from ..models import DownloadConfig
+from .s3 import FakeS3Client
+from .server import MediaServer
+from .stub import QuietUIManager, StubPlatform
+
+@dataclass
+class Measurement:
+    """One benchmark result."""
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+    def to_dict(self) -> Dict:
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+def _stub_downloader(server: MediaServer) -> VideoDownloader:
+    downloader = VideoDownloader(QuietUIManager())
+    downloader.register_platform(StubPlatform(server.host))
+    return downloader
+
+def bench_download(quick: bool = False) -> List[Measurement]:
+    """End-to-end ``VideoDownloader.download()`` throughput from the local server."""
+    size = (8 if quick else 64) * 1024 * 1024
+    repeat = 2 if quick else 5
+    measurements = []
+    with MediaServer() as server:
+        downloader = _stub_downloader(server)
+        cases = {
+            "download_progressive": lambda i: server.progressive_url(f"p{i}", size),
+            "download_hls": lambda i: server.hls_url(f"h{i}", size, 32),
+        }
+        for name, make_url in cases.items():
+            rates = []
+            for i in range(repeat):
+                with tempfile.TemporaryDirectory() as output_dir:
+                    started = time.perf_counter()
+                    if not downloader.download(make_url(i), DownloadConfig(output_dir=output_dir)):
+                        raise RuntimeError(f"{name} failed to download {make_url(i)}")
+                    rates.append(size / (time.perf_counter() - started) / 1e6)
+            measurements.append(Measurement(f"{name}_throughput", statistics.median(rates), "MB/s", True))
+    return measurements
+
+def bench_detect_platform(quick: bool = False) -> List[Measurement]:
+    """``detect_platform()`` throughput over a mix of supported and unsupported URLs."""
+    samples = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/playlist?list=PL590L5WQmH8fJ54F369BLDSqIwcs-TCfs",
+        "https://vimeo.com/76979871",
+        "https://twitter.com/user/status/1234567890123456789",
+        "https://x.com/user/status/1234567890123456789",
+        "https://www.tiktok.com/@user/video/7234567890123456789",
+        "https://www.instagram.com/reel/Cabc123XYZ/",
+        "https://example.com/not/a/video",
+        "not a url",
+    ]
+    total = 20000 if quick else 200000
+    urls = [samples[i % len(samples)] for i in range(total)]
+    downloader = VideoDownloader(QuietUIManager())
+    detect = downloader.detect_platform
+
+    started = time.perf_counter()
+    for url in urls:
+        detect(url)
+    elapsed = time.perf_counter() - started
+    return [Measurement("detect_platform_rate", total / elapsed, "urls/s", True)]
+
+def bench_progress_hook(quick: bool = False) -> List[Measurement]:
+    """Cost of one ``ProgressHandler`` hook call while the display is rendering."""
+    try:
+        from rich.console import Console
+    except ImportError:
+        return []
+
+    class ConsoleUI(QuietUIManager):
+        console = Console(file=io.StringIO(), force_terminal=True, width=120)
+
+    calls = 50000 if quick else 500000
+    files = [f"/tmp/bench/file{i}.mp4" for i in range(8)]
+    updates = [{"status": "downloading", "filename": files[i % len(files)], "downloaded_bytes": i * 1024,
+                "total_bytes": calls * 1024} for i in range(calls)]
+
+    handler = ProgressHandler(ConsoleUI())
+    with handler:
+        started = time.perf_counter()
+        for d in updates:
+            handler(d)
+        elapsed = time.perf_counter() - started
+    return [Measurement("progress_hook_call", elapsed / calls * 1e9, "ns", False)]
+
+def bench_s3_upload(quick: bool = False) -> List[Measurement]:
+    """``S3Sink.store()`` multipart throughput against a fake client with per-part latency."""
+    part_size = 5 * 1024 * 1024
+    size = (4 if quick else 16) * part_size + 12345
+    data = os.urandom(size)
+    client = FakeS3Client(latency=0.05)
+    sink = S3Sink("bench", "media", client=client, part_size=part_size, max_pending=4)
+    try:
+        rates = []
+        for i in range(2 if quick else 5):
+            with tempfile.NamedTemporaryFile(delete=False) as f:
+                f.write(data)
+            started = time.perf_counter()
+            sink.store(f.name, f"clip{i}.mp4")
+            rates.append(size / (time.perf_counter() - started) / 1e6)
+            if client.objects.get(("bench", f"media/clip{i}.mp4")) != data:
+                raise RuntimeError(f"clip{i}.mp4 was not stored intact")
+
+        # A failed upload must not leave a multipart upload behind
+        client.fail_complete = True
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        try:
+            sink.store(f.name, "broken.mp4")
+        except ConnectionError:
+            pass
+        finally:
+            os.unlink(f.name)
+        if client.uploads or not client.aborted:
+            raise RuntimeError(f"Failed upload was not aborted, {len(client.uploads)} upload(s) left open")
+    finally:
+        sink.close()
+    return [Measurement("s3_upload_throughput", statistics.median(rates), "MB/s", True),
+            Measurement("s3_upload_parts_in_flight", client.peak_parts_in_flight, "parts", True)]
+
+# Short commands that must not pay for downloading or the full-screen UIs
+STARTUP_COMMANDS = {
+    "cli_startup_help": ["--help"],
+    "cli_startup_show_features": ["--show-features"],
+    "cli_startup_list_platforms": ["--list-platforms", "--basic"],
+}
+STARTUP_BUDGET_MS = 250
+HEAVY_MODULES = ("yt_dlp", "rich", "textual", "art", "sqlite3", "asyncio")
+
+# Runs the CLI in-process and reports which heavy modules it imported
+_IMPORT_PROBE = """
+import runpy, sys
+sys.argv = [sys.argv[1]] + sys.argv[2:]
+try:
+    runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+except SystemExit:
+    pass
+sys.stderr.write(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+def _cli_environment():
+    package = __package__.rsplit(".", 1)[0]
+    package_dir = os.path.dirname(os.path.abspath(sys.modules[package].__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(package_dir), env.get("PYTHONPATH")]))
+    return package, env
+
+def bench_cli_startup(quick: bool = False) -> List[Measurement]:
+    """Wall time of fresh interpreters running short CLI commands."""
+    package, env = _cli_environment()
+    runs = 3 if quick else 10
+    measurements = []
+    for name, args in STARTUP_COMMANDS.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-m", package] + args, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+        measurements.append(Measurement(name, statistics.median(timings) * 1000, "ms", False))
+    return measurements
+
+def check_startup(budget_ms: float = STARTUP_BUDGET_MS) -> List[str]:
+    """Check the short CLI commands against the start-up budget.
+
+    Returns a description of every command that imported a heavy module
+    or whose median start-up time exceeded ``budget_ms``.
+    """
+    package, env = _cli_environment()
+    probe = _IMPORT_PROBE.format(heavy=HEAVY_MODULES)
+    problems = []
+    for name, args in STARTUP_COMMANDS.items():
+        completed = subprocess.run([sys.executable, "-c", probe, package] + args, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        imported = completed.stderr.strip().splitlines()[-1:] if completed.stderr.strip() else []
+        if imported:
+            problems.append(f"{' '.join(args)} imported {imported[0]}")
+
+    for measurement in bench_cli_startup(quick=False):
+        if measurement.value > budget_ms:
+            problems.append(f"{measurement.name} took {measurement.value:.0f} ms (budget {budget_ms:.0f} ms)")
+    return problems
+
+BENCHMARKS: Dict[str, Callable[[bool], List[Measurement]]] = {
+    "download": bench_download,
+    "detect_platform": bench_detect_platform,
+    "progress_hook": bench_progress_hook,
+    "s3_upload": bench_s3_upload,
+    "cli_startup": bench_cli_startup,
+}
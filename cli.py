@@ -1,17 +1,22 @@
 """Enhanced command-line interface with graphical options."""
 
 import argparse
+import contextlib
+import itertools
+import os
 import sys
+import tempfile
 import logging
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List
 
-from .core import VideoDownloader
-from .models import DownloadConfig, QualityPreset
-from .ui import DefaultUIManager, ENHANCED_UI_AVAILABLE, TEXTUAL_AVAILABLE
-from .utils import setup_logging
+from .models import DownloadConfig, DownloadStatus, QualityPreset
+from .ui import ENHANCED_UI_AVAILABLE, TEXTUAL_AVAILABLE, UIEventBus
+from .utils import iter_urls, setup_logging
 
-if TEXTUAL_AVAILABLE:
-    from .ui.textual_ui import MediaDownloaderApp
+# The core and the Rich/Textual UIs are imported only by the code paths
+# that use them, so --help and friends start fast
+if TYPE_CHECKING:
+    from .core import VideoDownloader
 
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure the argument parser."""
@@ -24,6 +29,10 @@ def create_argument_parser() -> argparse.ArgumentParser:
   %(prog)s -a -o music/ https://www.youtube.com/watch?v=example
   %(prog)s -q 720p https://www.youtube.com/watch?v=example
   %(prog)s --interactive
+  %(prog)s -b urls.txt -j 8      # Batch download, 8 at a time
+  producer | %(prog)s -b -       # Stream URLs from stdin
+  %(prog)s -b urls.txt --journal batch.journal   # Resumable batch
+  %(prog)s -b urls.txt --metrics-port 9464       # Prometheus metrics while running
   %(prog)s --tui          # Launch graphical terminal interface
   %(prog)s --enhanced     # Enhanced Rich UI with animations
   %(prog)s --list-platforms
@@ -44,13 +53,70 @@ def create_argument_parser() -> argparse.ArgumentParser:
     
     # Optional arguments
     parser.add_argument("-o", "--output", default="downloads", 
-                       help="Output directory (default: downloads)")
+                       help="Output directory or s3://BUCKET/PREFIX (default: downloads)")
+    parser.add_argument("--s3-endpoint", metavar="URL",
+                       help="Endpoint of an S3-compatible store for s3:// output, e.g. http://localhost:9000")
     parser.add_argument("-a", "--audio", action="store_true", 
                        help="Download audio only (MP3)")
+    parser.add_argument("--stdout", action="store_true",
+                       help="Stream the media to stdout instead of a file (single videos, progressive formats only; "
+                            "with -a the audio stays in its original codec)")
     parser.add_argument("-q", "--quality", 
                        choices=["best", "worst", "1080p", "720p", "480p"],
                        default="1080p", help="Video quality preset (default: 1080p)")
     
+    # Batch mode
+    parser.add_argument("-b", "--batch", nargs="+", metavar="SOURCE",
+                       help="Read URLs (one per line) from files, glob patterns or '-' for stdin")
+    parser.add_argument("-j", "--workers", type=int, default=4,
+                       help="Concurrent downloads in batch mode (default: 4)")
+    parser.add_argument("--platform-limit", action="append", default=[], metavar="NAME=N",
+                       help="Limit concurrent downloads for a platform, e.g. Instagram=2 (repeatable)")
+    parser.add_argument("--adaptive", action="store_true",
+                       help="Grow per-platform concurrency while downloads succeed, back off when throttled "
+                            "and pause platforms that keep failing (limits above become ceilings)")
+    
+    parser.add_argument("--limit-rate", metavar="RATE",
+                       help="Cap the combined download rate of all jobs, e.g. 5M (bytes/s)")
+    parser.add_argument("--rate-window", action="append", default=[], metavar="HH:MM-HH:MM=RATE",
+                       help="Use another rate during a time of day, e.g. 09:00-18:00=2M or 22:00-06:00=0 "
+                            "for no limit (repeatable)")
+    parser.add_argument("--platform-weight", action="append", default=[], metavar="NAME=W",
+                       help="Share of the rate a platform gets while others download too, e.g. YouTube=3 "
+                            "(default weight: 1, repeatable)")
+    
+    parser.add_argument("--scratch-dir", metavar="DIR",
+                       help="Download and merge in DIR (e.g. a local SSD) and move finished files to the output "
+                            "directory")
+    parser.add_argument("--playlist-workers", type=int, default=1, metavar="N",
+                       help="Download N entries of a playlist or channel at once (default: 1)")
+    parser.add_argument("--pp-workers", type=int, metavar="N",
+                       help="Parallel ffmpeg post-processing jobs (default: CPU count, 0 = run inside yt-dlp)")
+    parser.add_argument("--journal", metavar="PATH",
+                       help="Record batch progress in a journal and resume unfinished jobs from it")
+    parser.add_argument("--retry-failed", action="store_true",
+                       help="With --journal, also re-run jobs that failed permanently in an earlier run")
+    parser.add_argument("--archive", metavar="PATH",
+                       help="SQLite download archive; media already in it is skipped")
+    parser.add_argument("--dedup-index", metavar="PATH",
+                       help="SQLite index of file hashes; identical downloads are stored once via reflinks or hardlinks")
+    parser.add_argument("--verify", action="store_true",
+                       help="Probe finished files, re-download truncated ones and keep a hash manifest per directory")
+    parser.add_argument("--scrub", metavar="DIR",
+                       help="Re-verify every downloaded file under DIR against its manifest and exit")
+    parser.add_argument("--scrub-rate", default="50M", metavar="RATE",
+                       help="Read rate limit of --scrub, e.g. 200M (default: 50M, 0 = unlimited)")
+    parser.add_argument("--info-cache", metavar="DIR",
+                       help="Cache extracted video metadata on disk and reuse it across runs")
+    parser.add_argument("--info-cache-size", type=int, default=256, metavar="MB",
+                       help="Maximum size of the metadata cache (default: 256)")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                       help="Run as a daemon with a local HTTP job API (workers: -j) until SIGTERM")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                       help="Write OpenMetrics download metrics to PATH when finished")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                       help="Serve OpenMetrics download metrics on localhost:PORT/metrics")
+    
     # UI Mode Selection
     ui_group = parser.add_mutually_exclusive_group()
     ui_group.add_argument("-i", "--interactive", action="store_true", 
@@ -91,6 +157,75 @@ def get_quality_preset_mapping() -> Dict[str, QualityPreset]:
         "480p": QualityPreset.SD_480P,
     }
 
+def parse_platform_limits(values: List[str]) -> Dict[str, int]:
+    """Parse NAME=N pairs into a platform concurrency limit mapping."""
+    limits = {}
+    for value in values:
+        name, sep, limit = value.rpartition("=")
+        if not sep or not name or not limit.isdigit() or int(limit) < 1:
+            raise ValueError(f"Invalid platform limit '{value}', expected NAME=N")
+        limits[name] = int(limit)
+    return limits
+
+def parse_platform_weights(values: List[str]) -> Dict[str, float]:
+    """Parse NAME=W pairs into a platform bandwidth weight mapping."""
+    weights = {}
+    for value in values:
+        name, sep, weight = value.rpartition("=")
+        try:
+            weight = float(weight)
+        except ValueError:
+            weight = 0
+        if not sep or not name or weight <= 0:
+            raise ValueError(f"Invalid platform weight '{value}', expected NAME=W with W > 0")
+        weights[name] = weight
+    return weights
+
+def create_bandwidth_scheduler(args):
+    """Build the shared bandwidth scheduler, or None without any rate options."""
+    from .core.bandwidth import BandwidthScheduler, RateWindow, parse_rate
+    
+    scheduler = BandwidthScheduler(
+        rate=parse_rate(args.limit_rate) if args.limit_rate else None,
+        windows=[RateWindow.parse(window) for window in args.rate_window],
+        weights=parse_platform_weights(args.platform_weight)
+    )
+    return scheduler if scheduler.enabled else None
+
+def run_scrub(ui_manager, args) -> int:
+    """Re-verify a library against its manifests. Returns 1 if any file is damaged or missing."""
+    from .core.bandwidth import TokenBucket, parse_rate
+    from .core.integrity import IntegrityChecker
+    
+    bucket = TokenBucket(parse_rate(args.scrub_rate))
+    counts = {"ok": 0, "added": 0, "changed": 0, "broken": 0, "missing": 0}
+    for report in IntegrityChecker().scrub(args.scrub, throttle=bucket.consume):
+        counts[report["status"]] += 1
+        if report["status"] in ("changed", "broken"):
+            ui_manager.show_error(f"{report['path']}: {report['error']}")
+        elif report["status"] == "missing":
+            ui_manager.show_error(f"{report['path']}: listed in the manifest but missing")
+    ui_manager.show_info("Scrub finished: " + ", ".join(f"{count} {status}" for status, count in counts.items()))
+    return 1 if counts["changed"] or counts["broken"] or counts["missing"] else 0
+
+def parse_listen_address(value: str):
+    """Parse [HOST:]PORT into a (host, port) pair, defaulting to localhost."""
+    host, _, port = value.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{value}', expected [HOST:]PORT")
+    return host or "127.0.0.1", int(port)
+
+def run_server(downloader: "VideoDownloader", args, config: DownloadConfig) -> int:
+    """Serve the HTTP job API until SIGTERM, then let running jobs finish."""
+    from .core.service import DownloadService
+    from .server import DownloadServer
+    
+    host, port = parse_listen_address(args.serve)
+    service = DownloadService(downloader, max_workers=args.workers)
+    server = DownloadServer(service, config, host=host, port=port)
+    downloader.ui_manager.show_info(f"Download API listening on {server.url} (Ctrl+C or SIGTERM to stop)")
+    return 0 if server.run() else 1
+
 def show_features():
     """Show available UI features."""
     print("🎨 Available UI Features:")
@@ -132,6 +267,7 @@ def create_ui_manager(args):
         return ui
     else:
         # Use the best available UI
+        from .ui import DefaultUIManager
         ui = DefaultUIManager()
         if hasattr(ui, 'animation_enabled'):
             ui.animation_enabled = not args.no_animation
@@ -139,12 +275,93 @@ def create_ui_manager(args):
             ui.current_theme = args.theme
         return ui
 
+def run_batch(downloader: "VideoDownloader", ui_manager, args, config: DownloadConfig) -> int:
+    """Download URLs streamed from the batch sources."""
+    from .core import BatchDownloader, JobJournal, ProgressHandler
+    
+    journal = JobJournal(args.journal) if args.journal else None
+    urls = iter_urls(args.batch or [])
+    if journal:
+        # Unfinished jobs from an interrupted run go first
+        resumed = journal.unfinished(failed=args.retry_failed)
+        if resumed:
+            ui_manager.show_info(f"Resuming {len(resumed)} unfinished job(s) from {args.journal}")
+        urls = itertools.chain(resumed, urls)
+    
+    # One progress display for the whole batch
+    progress = ProgressHandler(ui_manager)
+    batch = BatchDownloader(
+        downloader,
+        max_workers=args.workers,
+        platform_limits=parse_platform_limits(args.platform_limit),
+        journal=journal,
+        hooks=[progress],
+        adaptive=args.adaptive,
+        retry_failed=args.retry_failed
+    )
+    
+    succeeded = skipped = failed = 0
+    try:
+        with progress, contextlib.closing(batch.run(urls, config)) as results:
+            for result in results:
+                if result.status == DownloadStatus.SKIPPED:
+                    skipped += 1
+                    ui_manager.show_info(f"{result.url}: {result.error}")
+                elif result.ok:
+                    succeeded += 1
+                    ui_manager.show_success(f"{result.url} ({len(result.files)} file(s))")
+                else:
+                    failed += 1
+                    ui_manager.show_error(f"{result.url}: {result.error}")
+                for entry in result.entries:
+                    if entry.status == DownloadStatus.FAILED:
+                        ui_manager.show_error(f"{entry.url}: {entry.error}")
+    finally:
+        if journal:
+            journal.close()
+    
+    ui_manager.show_info(f"Batch finished: {succeeded} succeeded, {skipped} skipped, {failed} failed")
+    return 0 if failed == 0 else 1
+
+def show_platforms(ui_manager):
+    """List supported platforms with enhanced display."""
+    if hasattr(ui_manager, 'console'):
+        # Show a fancy platform list
+        ui_manager.console.print("\n🌟 [bold cyan]Supported Platforms[/bold cyan] 🌟\n")
+        
+        from rich.table import Table
+        from rich.box import ROUNDED
+        
+        table = Table(title="📋 Platform Support", box=ROUNDED)
+        table.add_column("Platform", style="bold cyan", width=15)
+        table.add_column("Emoji", style="yellow", width=8)
+        table.add_column("Domains", style="green", width=30)
+        table.add_column("Content Types", style="magenta", width=20)
+        
+        platform_data = [
+            ("YouTube", "📺", "youtube.com, youtu.be", "Videos, Playlists, Channels"),
+            ("Vimeo", "🎥", "vimeo.com", "Videos"),
+            ("Twitter/X", "🐦", "twitter.com, x.com", "Videos"),
+            ("TikTok", "🎵", "tiktok.com", "Videos"),
+            ("Instagram", "📸", "instagram.com", "Videos, Reels"),
+        ]
+        
+        for platform, emoji, domains, content in platform_data:
+            table.add_row(platform, emoji, domains, content)
+        
+        ui_manager.console.print(table)
+        ui_manager.console.print("\n✨ [bold green]Ready to download from any of these platforms![/bold green] ✨\n")
+    else:
+        from .core import VideoDownloader
+        VideoDownloader(ui_manager).list_platforms()
+
 async def run_tui_mode():
     """Run the Textual TUI application."""
     if not TEXTUAL_AVAILABLE:
         print("❌ Textual is not installed. Install with: pip install textual")
         return 1
     
+    from .ui.textual_ui import MediaDownloaderApp
     app = MediaDownloaderApp()
     await app.run_async()
     return 0
@@ -154,6 +371,42 @@ def main(args=None) -> int:
     parser = create_argument_parser()
     parsed_args = parser.parse_args(args)
     
+    if parsed_args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if parsed_args.playlist_workers < 1:
+        parser.error("--playlist-workers must be at least 1")
+    if parsed_args.pp_workers is not None and parsed_args.pp_workers < 0:
+        parser.error("--pp-workers must not be negative")
+    if parsed_args.stdout and (not parsed_args.url or parsed_args.batch or parsed_args.journal
+                               or parsed_args.serve or parsed_args.interactive):
+        parser.error("--stdout needs a single URL and cannot be combined with -b, --journal, --serve or -i")
+    if parsed_args.stdout and parsed_args.output.startswith("s3://"):
+        parser.error("--stdout cannot be combined with s3:// output")
+    try:
+        parse_platform_limits(parsed_args.platform_limit)
+        bandwidth = create_bandwidth_scheduler(parsed_args)
+        if parsed_args.serve:
+            parse_listen_address(parsed_args.serve)
+        from .core.bandwidth import parse_rate
+        parse_rate(parsed_args.scrub_rate)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    sink = None
+    if parsed_args.stdout:
+        from .core.sinks import StreamSink
+        # The media owns stdout, every message goes to stderr for the rest of the process
+        sink = StreamSink(sys.stdout.buffer)
+        sys.stdout = sys.stderr
+    elif parsed_args.output.startswith("s3://"):
+        from .core.storage import S3Sink
+        try:
+            sink = S3Sink.from_url(parsed_args.output, endpoint_url=parsed_args.s3_endpoint)
+        except (ImportError, ValueError) as e:
+            parser.error(str(e))
+        # Media that cannot be uploaded while it downloads is staged here first
+        parsed_args.output = os.path.join(tempfile.gettempdir(), "media_downloader")
+    
     # Setup logging
     log_level = getattr(logging, parsed_args.log_level.upper())
     setup_logging(level=log_level, filename=parsed_args.log_file)
@@ -180,54 +433,64 @@ def main(args=None) -> int:
         print("❌ Textual TUI mode failed to initialize.")
         return 1
     
-    downloader = VideoDownloader(ui_manager)
+    # Handle platform listing before setting up any download machinery
+    if parsed_args.list_platforms:
+        show_platforms(ui_manager)
+        return 0
+    
+    if parsed_args.scrub:
+        return run_scrub(ui_manager, parsed_args)
+    
+    from .core import (DedupIndex, DownloadArchive, DownloadMetrics, InfoCache, IntegrityChecker, PostProcessingStage,
+                       VideoDownloader)
+    
+    batch_mode = parsed_args.batch or parsed_args.journal
+    interactive = parsed_args.interactive or not (parsed_args.url or batch_mode or parsed_args.serve)
+    if not interactive:
+        # Render messages in the background so animations never stall downloads
+        ui_manager = UIEventBus(ui_manager)
+    
+    archive = DownloadArchive(parsed_args.archive) if parsed_args.archive else None
+    dedup = DedupIndex(parsed_args.dedup_index) if parsed_args.dedup_index else None
+    info_cache = None
+    if parsed_args.info_cache:
+        info_cache = InfoCache(parsed_args.info_cache, max_bytes=parsed_args.info_cache_size * 1024 * 1024)
+    postprocessing = None
+    if parsed_args.pp_workers != 0:
+        postprocessing = PostProcessingStage(max_workers=parsed_args.pp_workers)
+    metrics = None
+    if parsed_args.metrics_file or parsed_args.metrics_port is not None:
+        metrics = DownloadMetrics()
+        if parsed_args.metrics_port is not None:
+            metrics.serve(parsed_args.metrics_port)
+    downloader = VideoDownloader(ui_manager, archive=archive, info_cache=info_cache,
+                                 postprocessing=postprocessing, metrics=metrics, bandwidth=bandwidth,
+                                 dedup=dedup, integrity=IntegrityChecker() if parsed_args.verify else None)
     
     try:
-        # Handle platform listing with enhanced display
-        if parsed_args.list_platforms:
-            if hasattr(ui_manager, 'show_welcome'):
-                # Show a fancy platform list
-                ui_manager.console.print("\n🌟 [bold cyan]Supported Platforms[/bold cyan] 🌟\n")
-                
-                from rich.table import Table
-                from rich.box import ROUNDED
-                
-                table = Table(title="📋 Platform Support", box=ROUNDED)
-                table.add_column("Platform", style="bold cyan", width=15)
-                table.add_column("Emoji", style="yellow", width=8)
-                table.add_column("Domains", style="green", width=30)
-                table.add_column("Content Types", style="magenta", width=20)
-                
-                platform_data = [
-                    ("YouTube", "📺", "youtube.com, youtu.be", "Videos, Playlists, Channels"),
-                    ("Vimeo", "🎥", "vimeo.com", "Videos"),
-                    ("Twitter/X", "🐦", "twitter.com, x.com", "Videos"),
-                    ("TikTok", "🎵", "tiktok.com", "Videos"),
-                    ("Instagram", "📸", "instagram.com", "Videos, Reels"),
-                ]
-                
-                for platform, emoji, domains, content in platform_data:
-                    table.add_row(platform, emoji, domains, content)
-                
-                ui_manager.console.print(table)
-                ui_manager.console.print("\n✨ [bold green]Ready to download from any of these platforms![/bold green] ✨\n")
-            else:
-                downloader.list_platforms()
-            return 0
-        
         # Interactive mode or no URL provided
-        if parsed_args.interactive or not parsed_args.url:
+        if interactive:
             downloader.run_interactive()
             return 0
         
-        # Single URL download mode
         quality_map = get_quality_preset_mapping()
         config = DownloadConfig(
             output_dir=parsed_args.output,
             audio_only=parsed_args.audio,
-            quality=quality_map[parsed_args.quality]
+            quality=quality_map[parsed_args.quality],
+            playlist_workers=parsed_args.playlist_workers,
+            scratch_dir=parsed_args.scratch_dir,
+            sink=sink
         )
         
+        if parsed_args.serve:
+            return run_server(downloader, parsed_args, config)
+        
+        # Batch mode
+        if batch_mode:
+            return run_batch(downloader, ui_manager, parsed_args, config)
+        
+        # Single URL download mode
         # Show enhanced download info if available
         if hasattr(ui_manager, 'show_platform_detection'):
             platform = downloader.detect_platform(parsed_args.url)
@@ -250,3 +513,20 @@ def main(args=None) -> int:
         else:
             print(f"❌ Unexpected error: {e}")
         return 1
+    finally:
+        downloader.close()
+        if postprocessing:
+            # Nothing is queued after a complete run; after an interrupt the queued jobs are dropped
+            postprocessing.close(cancel_pending=True)
+        if archive:
+            archive.close()
+        if dedup:
+            dedup.close()
+        if sink is not None and sink.stores_files:
+            sink.close()
+        if isinstance(ui_manager, UIEventBus):
+            ui_manager.close()
+        if metrics:
+            if parsed_args.metrics_file:
+                metrics.write_textfile(parsed_args.metrics_file)
+            metrics.close()
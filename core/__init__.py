@@ -1,7 +1,44 @@
-"""Core functionality for the media downloader."""
+"""Core functionality for the media downloader.
 
-from .base import Platform
-from .downloader import VideoDownloader
-from .progress import ProgressHandler
+Submodules are imported on first attribute access; the downloader pulls
+in yt-dlp, which is by far the slowest import of the CLI.
+"""
 
-__all__ = ['Platform', 'VideoDownloader', 'ProgressHandler']
\ No newline at end of file
+import importlib
+
+# Public names and the modules defining them
+_EXPORTS = {
+    'Platform': '.base',
+    'DownloadArchive': '.archive',
+    'BandwidthScheduler': '.bandwidth',
+    'TokenBucket': '.bandwidth',
+    'BatchDownloader': '.batch',
+    'DedupIndex': '.dedup',
+    'VideoDownloader': '.downloader',
+    'AsyncVideoDownloader': '.async_downloader',
+    'ErrorClass': '.errors',
+    'RetryPolicy': '.errors',
+    'InfoCache': '.info_cache',
+    'IntegrityChecker': '.integrity',
+    'JobJournal': '.journal',
+    'DownloadMetrics': '.metrics',
+    'PostProcessingStage': '.postprocess',
+    'ProgressHandler': '.progress',
+    'PlatformRouter': '.router',
+    'MediaSink': '.sinks',
+    'StreamSink': '.sinks',
+    'StorageSink': '.storage',
+    'LocalFileSink': '.storage',
+    'S3Sink': '.storage',
+    'Classification': '.router',
+    'YDLPool': '.ydl_pool',
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['Platform', 'DownloadArchive', 'BandwidthScheduler', 'TokenBucket', 'BatchDownloader', 'DedupIndex', 'VideoDownloader', 'AsyncVideoDownloader', 'ErrorClass', 'RetryPolicy', 'InfoCache', 'IntegrityChecker', 'JobJournal', 'DownloadMetrics', 'PostProcessingStage', 'ProgressHandler', 'PlatformRouter', 'MediaSink', 'StreamSink', 'StorageSink', 'LocalFileSink', 'S3Sink', 'Classification', 'YDLPool']
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Persistent archive of already downloaded media."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from ..models import DownloadConfig
+
+class DownloadArchive:
+    """SQLite-backed record of downloaded media.
+
+    Entries are keyed by (platform, media id, preset) so the same video can
+    be fetched once per quality preset. The database runs in WAL mode, which
+    lets several downloader processes share one archive file.
+
+    It also keeps a watermark per channel, the newest upload seen by the
+    last complete sync, so later syncs can stop listing at that point.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger("DownloadArchive")
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS downloads ("
+                " platform TEXT NOT NULL,"
+                " media_id TEXT NOT NULL,"
+                " preset TEXT NOT NULL,"
+                " filename TEXT,"
+                " downloaded_at REAL NOT NULL,"
+                " PRIMARY KEY (platform, media_id, preset)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                " platform TEXT NOT NULL,"
+                " channel TEXT NOT NULL,"
+                " preset TEXT NOT NULL,"
+                " media_id TEXT NOT NULL,"
+                " upload_date TEXT,"
+                " synced_at REAL NOT NULL,"
+                " PRIMARY KEY (platform, channel, preset)"
+                ") WITHOUT ROWID"
+            )
+
+    @staticmethod
+    def preset_of(config: DownloadConfig) -> str:
+        """Return the archive preset key for a download configuration."""
+        return "audio" if config.audio_only else config.quality.name
+
+    def contains(self, platform: str, media_id: str, preset: str) -> bool:
+        """Check whether the media was already downloaded with this preset."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM downloads WHERE platform = ? AND media_id = ? AND preset = ?",
+                (platform, media_id, preset)
+            ).fetchone()
+        return row is not None
+
+    def record(self, platform: str, media_id: str, preset: str, filename: Optional[str] = None):
+        """Record a downloaded media entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads (platform, media_id, preset, filename, downloaded_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (platform, media_id, preset, filename, time.time())
+            )
+        self.logger.debug(f"Archived {platform}:{media_id} [{preset}]")
+
+    def watermark(self, platform: str, channel: str, preset: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return the (media id, upload date) of the newest synced upload of a channel."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT media_id, upload_date FROM watermarks WHERE platform = ? AND channel = ? AND preset = ?",
+                (platform, channel, preset)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_watermark(self, platform: str, channel: str, preset: str, media_id: str,
+                      upload_date: Optional[str] = None):
+        """Move the watermark of a channel to its newest upload."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (platform, channel, preset, media_id, upload_date, synced_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (platform, channel, preset, media_id, upload_date, time.time())
+            )
+        self.logger.debug(f"Watermark of {platform}:{channel} [{preset}] moved to {media_id}")
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,132 @@
+"""asyncio front-end for the video downloader."""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+
+from ..models import (DownloadConfig, DownloadEvent, DownloadFailed, DownloadFinished,
+                      DownloadProgress, DownloadResult, DownloadStarted, DownloadStatus,
+                      PostProcessing)
+from .downloader import VideoDownloader
+
+class AsyncVideoDownloader:
+    """Run downloads off the event loop and stream their progress as events.
+
+    Blocking yt-dlp work runs on a bounded thread pool. Each call to
+    :meth:`submit` returns an async iterator of typed events ending with
+    :class:`DownloadFinished` or :class:`DownloadFailed`. Progress events are
+    dropped rather than queued when the consumer falls behind, while
+    lifecycle events apply backpressure to the download thread.
+
+    Cancelling the consuming task, or closing the iterator, cancels the
+    download at its next progress tick::
+
+        async with AsyncVideoDownloader(downloader) as adl:
+            async for event in adl.submit(url, config):
+                ...
+    """
+
+    def __init__(self, downloader: VideoDownloader, max_workers: int = 4, max_queued_events: int = 64):
+        self.downloader = downloader
+        self.max_queued_events = max_queued_events
+        self.logger = logging.getLogger("AsyncVideoDownloader")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-download")
+
+    async def submit(self, url: str, config: DownloadConfig) -> AsyncIterator[DownloadEvent]:
+        """Start downloading ``url`` and yield its events as they happen."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue(maxsize=self.max_queued_events)
+        cancelled = threading.Event()
+
+        platform = self.downloader.detect_platform(url)
+        if platform is None:
+            result = DownloadResult(url, DownloadStatus.UNSUPPORTED, error="Invalid or unsupported URL")
+            yield DownloadFailed(url, result)
+            return
+
+        def offer(event: DownloadEvent):
+            # Runs on the loop: drop progress updates the consumer can't keep up with
+            try:
+                events.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+        def publish(event: DownloadEvent):
+            # Runs on the download thread: wait for room unless cancelled
+            future = asyncio.run_coroutine_threadsafe(events.put(event), loop)
+            while not cancelled.is_set():
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except concurrent.futures.TimeoutError:
+                    continue
+            future.cancel()
+
+        def progress_hook(d):
+            if d['status'] == 'downloading':
+                event = DownloadProgress(
+                    url,
+                    filename=os.path.basename(d.get('filename') or ''),
+                    downloaded_bytes=d.get('downloaded_bytes') or 0,
+                    total_bytes=d.get('total_bytes') or d.get('total_bytes_estimate'),
+                    speed=d.get('speed'),
+                    eta=d.get('eta'),
+                )
+                loop.call_soon_threadsafe(offer, event)
+
+        def postprocessor_hook(d):
+            filename = (d.get('info_dict') or {}).get('filepath')
+            publish(PostProcessing(url, d.get('postprocessor', ''), d.get('status', ''), filename))
+
+        yield DownloadStarted(url, platform.info.name, platform.classify_content(url))
+
+        job = loop.run_in_executor(
+            self._executor,
+            lambda: self.downloader._download_one(
+                url, config, False,
+                hooks=[progress_hook],
+                postprocessor_hooks=[postprocessor_hook],
+                cancelled=cancelled,
+            )
+        )
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, job}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event.done():
+                    yield next_event.result()
+                    continue
+
+                next_event.cancel()
+                while not events.empty():
+                    yield events.get_nowait()
+                result = job.result()
+                if result.ok:
+                    yield DownloadFinished(url, result)
+                else:
+                    yield DownloadFailed(url, result)
+                return
+        finally:
+            if not job.done():
+                cancelled.set()
+
+    async def download(self, url: str, config: DownloadConfig) -> DownloadResult:
+        """Download ``url`` and return its result, ignoring intermediate events."""
+        async for event in self.submit(url, config):
+            if isinstance(event, (DownloadFinished, DownloadFailed)):
+                return event.result
+        raise RuntimeError("Download ended without a result")
+
+    def close(self, wait: bool = True):
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,173 @@
+"""Process-wide bandwidth limiting for concurrent downloads."""
+
+import datetime
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+def parse_rate(value: str) -> Optional[float]:
+    """Parse a rate such as ``500K`` or ``2.5M`` into bytes per second.
+
+    ``0`` means no limit and is returned as None.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?(?:/s)?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid rate '{value}', expected a number with an optional K, M or G suffix")
+    rate = float(match.group(1)) * _UNITS[match.group(2).upper()]
+    return rate or None
+
+class TokenBucket:
+    """Thread-safe token bucket measured in bytes.
+
+    ``consume()`` takes tokens right away and sleeps off any debt, so chunks
+    larger than the burst size are fine and concurrent callers share the
+    rate. A rate of None disables limiting.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._burst = burst
+        self._rate = None
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_rate(rate)
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    def set_rate(self, rate: Optional[float]):
+        """Change the rate, keeping tokens already earned up to the new burst."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = rate or None
+            self._tokens = min(self._tokens, self._capacity())
+
+    def _capacity(self) -> float:
+        if self._burst is not None:
+            return self._burst
+        # One second worth of tokens
+        return self._rate or 0.0
+
+    def _refill(self, now: float):
+        if self._rate:
+            self._tokens = min(self._capacity(), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def consume(self, amount: float) -> float:
+        """Take ``amount`` tokens, sleeping until they are paid for. Returns the time slept."""
+        with self._lock:
+            if not self._rate:
+                return 0.0
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+@dataclass(frozen=True)
+class RateWindow:
+    """Rate applied between two times of day, ``end`` may be past midnight."""
+    start: datetime.time
+    end: datetime.time
+    rate: Optional[float]
+
+    @classmethod
+    def parse(cls, value: str) -> "RateWindow":
+        """Parse ``HH:MM-HH:MM=RATE``, for example ``09:00-18:00=2M``."""
+        match = re.fullmatch(r"\s*(\d{1,2}:\d{2})-(\d{1,2}:\d{2})=(.+)", value)
+        if not match:
+            raise ValueError(f"Invalid rate window '{value}', expected HH:MM-HH:MM=RATE")
+        try:
+            start, end = (datetime.datetime.strptime(t, "%H:%M").time() for t in match.group(1, 2))
+        except ValueError:
+            raise ValueError(f"Invalid time in rate window '{value}'")
+        return cls(start, end, parse_rate(match.group(3)))
+
+    def contains(self, moment: datetime.time) -> bool:
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+class BandwidthScheduler:
+    """Share one download rate between every job of the process.
+
+    All downloads draw from a global token bucket whose rate comes from
+    the first matching time-of-day window, or the default rate otherwise.
+    While several platforms are downloading, each one is also held to its
+    weighted share of that rate, so a heavy platform cannot starve the
+    others. Jobs take part through the progress hook from :meth:`hook`.
+    """
+
+    # A platform counts as downloading if it moved bytes this recently
+    ACTIVE_SECONDS = 2.0
+
+    def __init__(self, rate: Optional[float] = None, windows: Iterable[RateWindow] = (),
+                 weights: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.windows = list(windows)
+        self.weights = dict(weights or {})
+        self.logger = logging.getLogger("BandwidthScheduler")
+        self._lock = threading.Lock()
+        self._bucket = TokenBucket()
+        self._platform_buckets: Dict[str, TokenBucket] = {}
+        self._last_active: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rate or any(window.rate for window in self.windows))
+
+    def current_rate(self, now: Optional[datetime.datetime] = None) -> Optional[float]:
+        """Return the rate in force at ``now`` (default: the local time)."""
+        moment = (now or datetime.datetime.now()).time()
+        for window in self.windows:
+            if window.contains(moment):
+                return window.rate
+        return self.rate
+
+    def throttle(self, platform_name: str, amount: int) -> float:
+        """Account ``amount`` downloaded bytes, sleeping to keep within the limits."""
+        rate = self.current_rate()
+        now = time.monotonic()
+        with self._lock:
+            if rate != self._bucket.rate:
+                self.logger.debug(f"Bandwidth limit is now {rate or 'unlimited'}")
+                self._bucket.set_rate(rate)
+            self._last_active[platform_name] = now
+            active = [name for name, seen in self._last_active.items() if now - seen < self.ACTIVE_SECONDS]
+            total_weight = sum(self.weights.get(name, 1.0) for name in active)
+            share = rate * self.weights.get(platform_name, 1.0) / total_weight if rate else None
+            bucket = self._platform_buckets.setdefault(platform_name, TokenBucket())
+            if share != bucket.rate:
+                bucket.set_rate(share)
+        return bucket.consume(amount) + self._bucket.consume(amount)
+
+    def hook(self, platform_name: str) -> "_ThrottleHook":
+        """Return a yt-dlp progress hook throttling one job."""
+        return _ThrottleHook(self, platform_name)
+
+class _ThrottleHook:
+    def __init__(self, scheduler: BandwidthScheduler, platform_name: str):
+        self.scheduler = scheduler
+        self.platform_name = platform_name
+        self._seen: Dict[str, int] = {}
+
+    def __call__(self, d):
+        if d.get('status') != 'downloading':
+            return
+        filename = d.get('tmpfilename') or d.get('filename') or ''
+        downloaded = d.get('downloaded_bytes') or 0
+        if filename not in self._seen:
+            # Bytes of a resumed download were fetched earlier
+            self._seen[filename] = downloaded
+            return
+        delta = downloaded - self._seen[filename]
+        if delta > 0:
+            self._seen[filename] = downloaded
+            self.scheduler.throttle(self.platform_name, delta)
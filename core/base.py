@@ -15,10 +15,18 @@ class Platform(ABC):
         self.info = info
         self.logger = logging.getLogger(f"platform.{info.name.lower()}")
     
-    @abstractmethod
     def validate_url(self, url: str) -> bool:
         """Validate if URL belongs to this platform."""
-        pass
+        try:
+            parsed = urlparse(url)
+            return (self.info.matches_domain(parsed.netloc) and 
+                   self.info.matches_pattern(url))
+        except Exception:
+            return False
+    
+    def extract_media_id(self, url: str) -> Optional[str]:
+        """Extract the platform media id from a URL without network access."""
+        return self.info.extract_id(url)
     
     @abstractmethod
     def classify_content(self, url: str) -> ContentType:
@@ -0,0 +1,263 @@
+"""Concurrent batch download engine."""
+
+import heapq
+import logging
+import queue
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..models import DownloadConfig, DownloadResult, DownloadStatus
+from .concurrency import AdaptiveLimit
+
+if TYPE_CHECKING:
+    from .downloader import VideoDownloader
+    from .journal import JobJournal
+
+# Event kinds exchanged between the feeder thread, the workers and the dispatcher
+_URL = "url"
+_DONE = "done"
+_POSTPROCESSED = "postprocessed"
+_EOF = "eof"
+
+class BatchDownloader:
+    """Run many downloads on a bounded worker pool.
+
+    A global limit caps the number of concurrent jobs and optional
+    per-platform limits (keyed on ``Platform.info.name``) cap how many of
+    those may target the same platform. URLs are pulled lazily from the
+    input iterable, so at most ``max_pending`` of them are held in memory.
+    
+    With a ``journal`` every job transition is recorded, jobs that already
+    completed in an earlier run are skipped and duplicates within a run are
+    dropped. Jobs that failed permanently in an earlier run (private,
+    removed, unsupported, ...) are reported again without downloading,
+    unless ``retry_failed`` is set. ``hooks`` are extra yt-dlp progress hooks shared by every job,
+    such as a single ``ProgressHandler`` drawing the whole batch.
+    
+    With ``adaptive`` the per-platform limits become ceilings: each platform
+    starts low, grows while downloads succeed, backs off on throttling and
+    is paused for a while after a burst of failures (see :class:`AdaptiveLimit`).
+    
+    Failed jobs are retried according to the downloader's retry policies,
+    after a backoff delay that does not hold up a worker.
+    """
+
+    def __init__(self, downloader: "VideoDownloader", max_workers: int = 4,
+                 platform_limits: Optional[Dict[str, int]] = None,
+                 default_platform_limit: Optional[int] = None,
+                 max_pending: Optional[int] = None, journal: Optional["JobJournal"] = None,
+                 hooks: Optional[List[Callable]] = None, adaptive: bool = False, retry_failed: bool = False):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.downloader = downloader
+        self.max_workers = max_workers
+        self.platform_limits = dict(platform_limits or {})
+        self.default_platform_limit = default_platform_limit
+        self.max_pending = max_pending or max_workers * 4
+        self.journal = journal
+        self.hooks = list(hooks or [])
+        self.adaptive = adaptive
+        self.retry_failed = retry_failed
+        self.adaptive_limits: Dict[str, AdaptiveLimit] = {}
+        self.logger = logging.getLogger("BatchDownloader")
+
+    def _max_limit_for(self, platform_name: str) -> int:
+        limit = self.platform_limits.get(platform_name, self.default_platform_limit)
+        return self.max_workers if limit is None else max(1, limit)
+
+    def _adaptive_limit(self, platform_name: str) -> AdaptiveLimit:
+        if platform_name not in self.adaptive_limits:
+            self.adaptive_limits[platform_name] = AdaptiveLimit(platform_name, self._max_limit_for(platform_name))
+        return self.adaptive_limits[platform_name]
+
+    def _limit_for(self, platform_name: str) -> int:
+        """Return the concurrency limit for a platform."""
+        if self.adaptive:
+            return self._adaptive_limit(platform_name).current()
+        return self._max_limit_for(platform_name)
+
+    def _next_wakeup(self, retries: List[Tuple[float, str, str]]) -> Optional[float]:
+        """Seconds until a retry is due or a paused platform may start a job again."""
+        delays = [limit.reopens_in() for limit in self.adaptive_limits.values()]
+        if retries:
+            delays.append(max(0.0, retries[0][0] - time.monotonic()))
+        delays = [delay for delay in delays if delay is not None]
+        return min(delays) if delays else None
+
+    def _feed(self, urls: Iterable[str], events: "queue.Queue", slots: threading.Semaphore,
+              stop: threading.Event):
+        """Pull URLs from the input and hand them to the dispatcher."""
+        try:
+            for url in urls:
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                events.put((_URL, url))
+            events.put((_EOF, None))
+        except Exception as e:
+            events.put((_EOF, e))
+
+    def run(self, urls: Iterable[str], config: DownloadConfig) -> Iterator[DownloadResult]:
+        """Download every URL and yield results in completion order."""
+        events: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        slots = threading.BoundedSemaphore(self.max_pending)
+        stop = threading.Event()
+        feeder = threading.Thread(target=self._feed, args=(urls, events, slots, stop),
+                                  name="batch-feeder", daemon=True)
+
+        waiting: Dict[str, Deque[str]] = defaultdict(deque)
+        active: Counter = Counter()
+        in_flight: Dict[Future, Tuple[str, str]] = {}
+        seen: Set[str] = set()
+        attempts: Counter = Counter()
+        # (due time, platform, url) of failed jobs waiting for their backoff
+        retries: List[Tuple[float, str, str]] = []
+        postprocessing = 0
+        queued = 0
+        exhausted = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download")
+        try:
+            feeder.start()
+            while not (exhausted and queued == 0 and not in_flight and postprocessing == 0 and not retries):
+                try:
+                    kind, payload = events.get(timeout=self._next_wakeup(retries))
+                except queue.Empty:
+                    # A retry is due or a paused platform may take jobs again
+                    kind, payload = None, None
+
+                if kind == _URL:
+                    url = payload.strip()
+                    if self.journal is not None:
+                        if url in seen:
+                            slots.release()
+                            continue
+                        seen.add(url)
+                        if self.journal.is_done(url):
+                            slots.release()
+                            yield DownloadResult(url, DownloadStatus.SKIPPED,
+                                                 error="Already completed in an earlier run")
+                            continue
+                        if not self.retry_failed and self.journal.failed_permanently(url):
+                            slots.release()
+                            yield DownloadResult(url, DownloadStatus.FAILED,
+                                                 error=f"Failed in an earlier run: {self.journal.get(url).error}")
+                            continue
+                    
+                    platform = self.downloader.detect_platform(url)
+                    if platform is None:
+                        slots.release()
+                        result = DownloadResult(url, DownloadStatus.UNSUPPORTED,
+                                                error="Invalid or unsupported URL")
+                        if self.journal is not None:
+                            self.journal.finished(url, False, result.error)
+                        if self.downloader.metrics:
+                            self.downloader.metrics.job("unknown").finish(result)
+                        yield result
+                    else:
+                        if self.journal is not None:
+                            self.journal.queued(url)
+                        waiting[platform.info.name].append(url)
+                        queued += 1
+
+                elif kind == _DONE:
+                    platform_name, url = in_flight.pop(payload)
+                    active[platform_name] -= 1
+                    result = self._result_of(payload, url)
+                    if self.adaptive:
+                        self._adaptive_limit(platform_name).record(result)
+                    delay = self.downloader.retry_delay(result, attempts[url])
+                    if delay is not None:
+                        self.logger.info(f"Retrying {url} in {delay:.1f}s after: {result.error}")
+                        if self.downloader.metrics:
+                            self.downloader.metrics.retries.inc(platform_name)
+                        heapq.heappush(retries, (time.monotonic() + delay, platform_name, url))
+                    elif result.postprocessing:
+                        # The download slot is free again, report once ffmpeg is done
+                        postprocessing += 1
+                        self._notify_when_postprocessed(result, events)
+                    else:
+                        slots.release()
+                        del attempts[url]
+                        if self.journal is not None:
+                            self.journal.finished(url, result.ok, result.error)
+                        yield result
+
+                elif kind == _POSTPROCESSED:
+                    postprocessing -= 1
+                    slots.release()
+                    result = payload
+                    del attempts[result.url]
+                    if self.journal is not None:
+                        self.journal.finished(result.url, result.ok, result.error)
+                    yield result
+
+                elif kind == _EOF:
+                    exhausted = True
+                    if payload is not None:
+                        raise payload
+
+                while retries and retries[0][0] <= time.monotonic():
+                    _, platform_name, url = heapq.heappop(retries)
+                    waiting[platform_name].append(url)
+                    queued += 1
+                
+                # Start as many waiting jobs as the limits allow
+                for platform_name, pending in waiting.items():
+                    limit = self._limit_for(platform_name)
+                    while pending and len(in_flight) < self.max_workers and active[platform_name] < limit:
+                        url = pending.popleft()
+                        queued -= 1
+                        active[platform_name] += 1
+                        attempts[url] += 1
+                        if self.journal is not None:
+                            self.journal.started(url)
+                        future = executor.submit(self.downloader._download_one, url, config, False,
+                                                 hooks=self.hooks, wait_postprocessing=False)
+                        in_flight[future] = (platform_name, url)
+                        future.add_done_callback(lambda f: events.put((_DONE, f)))
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _notify_when_postprocessed(self, result: DownloadResult, events: "queue.Queue"):
+        """Post an event once every deferred post-processing job of a result finished.
+
+        Moving, hashing and deduplicating the final files runs on the
+        post-processing stage first, so a large file never holds up the
+        dispatch of other jobs.
+        """
+        remaining = [len(result.postprocessing)]
+        lock = threading.Lock()
+
+        def on_done(_future):
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self.downloader.postprocessing.run(self._finish_postprocessing, result, events)
+
+        for _, future in list(result.postprocessing):
+            future.add_done_callback(on_done)
+
+    def _finish_postprocessing(self, result: DownloadResult, events: "queue.Queue"):
+        try:
+            self.downloader._finish_postprocessing(result)
+        except Exception as e:
+            self.logger.error(f"Finishing the files of {result.url} failed: {e}")
+            result.status = DownloadStatus.FAILED
+            result.error = str(e)
+        events.put((_POSTPROCESSED, result))
+
+    def _result_of(self, future: Future, url: str) -> DownloadResult:
+        """Unwrap a finished job, turning unexpected errors into failed results."""
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.error(f"Download job for {url} crashed: {e}")
+            return DownloadResult(url, DownloadStatus.FAILED, error=str(e))
@@ -0,0 +1,96 @@
+"""Adaptive per-platform concurrency limits."""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from ..models import DownloadResult, DownloadStatus
+from .errors import ErrorClass, classify
+
+class AdaptiveLimit:
+    """AIMD concurrency limit for one platform, with a circuit breaker.
+
+    The limit grows by ``increase`` per window of successful downloads (one
+    window being ``limit`` downloads) and is multiplied by ``decrease`` on
+    every throttling signal. After ``failure_threshold`` failures in a row
+    the breaker opens and the platform gets no new jobs for ``cooldown``
+    seconds. A single probe job then runs; if it fails too the breaker
+    reopens with twice the cooldown, up to ``max_cooldown``.
+    """
+
+    def __init__(self, name: str, maximum: int, initial: Optional[int] = None, minimum: int = 1,
+                 increase: float = 1.0, decrease: float = 0.5, failure_threshold: int = 5,
+                 cooldown: float = 60.0, max_cooldown: float = 900.0):
+        self.name = name
+        self.maximum = max(minimum, maximum)
+        self.minimum = minimum
+        self.increase = increase
+        self.decrease = decrease
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.logger = logging.getLogger("AdaptiveLimit")
+        self._lock = threading.Lock()
+        self._limit = float(min(self.maximum, initial or max(minimum, 2)))
+        self._failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    def current(self, now: Optional[float] = None) -> int:
+        """Number of jobs that may run for the platform right now."""
+        with self._lock:
+            if self._open_until:
+                if (now or time.monotonic()) < self._open_until:
+                    return 0
+                # Half-open: let one job find out whether the platform recovered
+                self._probing = True
+                return 1
+            return max(self.minimum, int(self._limit))
+
+    def reopens_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until an open breaker lets a probe through, None if it already does."""
+        with self._lock:
+            remaining = self._open_until - (now or time.monotonic())
+        return remaining if self._open_until and remaining > 0 else None
+
+    def record(self, result: DownloadResult):
+        """Adjust the limit after a finished download."""
+        if result.status == DownloadStatus.SUCCESS:
+            self._on_success()
+        elif result.status == DownloadStatus.FAILED:
+            # Permanent errors say nothing about the platform's health
+            error_class = classify(result.error).error_class
+            if error_class == ErrorClass.THROTTLED:
+                self._on_failure(throttled=True)
+            elif error_class == ErrorClass.TRANSIENT:
+                self._on_failure(throttled=False)
+
+    def _on_success(self):
+        with self._lock:
+            if self._open_until:
+                self.logger.info(f"{self.name} recovered, resuming downloads")
+            self._failures = 0
+            self._open_until = 0.0
+            self._probing = False
+            self._cooldown = self.base_cooldown
+            self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+
+    def _on_failure(self, throttled: bool):
+        with self._lock:
+            self._failures += 1
+            if throttled:
+                self._limit = max(self.minimum, self._limit * self.decrease)
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._probing:
+                    self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open_until = time.monotonic() + self._cooldown
+                self._probing = False
+                self._failures = 0
+                self._limit = float(self.minimum)
+                self.logger.warning(f"Pausing {self.name} for {self._cooldown:.0f}s after repeated failures")
@@ -0,0 +1,167 @@
+"""Content-hash deduplication of downloaded files."""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ..utils.hashing import hash_file
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request cloning a whole file on Linux (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+LINK_MODES = ("auto", "reflink", "hardlink")
+
+def reflink(source: str, target: str) -> bool:
+    """Create ``target`` as a copy-on-write clone of ``source`` if the filesystem allows it."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(target)
+        return False
+
+def link_duplicate(source: str, target: str, mode: str = "auto") -> Optional[str]:
+    """Replace ``target`` with a reflink or hardlink to ``source``.
+
+    The link is made next to ``target`` and renamed over it, so ``target``
+    is never missing. Returns the kind of link made, None if neither is
+    possible here (other filesystem, no reflink support, ...).
+    """
+    tmp = f"{target}.dedup-tmp"
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(tmp)
+    kind = None
+    if mode in ("auto", "reflink") and reflink(source, tmp):
+        kind = "reflink"
+    elif mode in ("auto", "hardlink"):
+        try:
+            os.link(source, tmp)
+            kind = "hardlink"
+        except OSError:
+            pass
+    if kind:
+        os.replace(tmp, target)
+    return kind
+
+class DedupIndex:
+    """SQLite index of downloaded files by content hash.
+
+    Every finished file is hashed and looked up; when an identical file is
+    already indexed, the new one is replaced by a link to it under its own
+    name, so a clip fetched from several platforms keeps each platform's
+    filename but is stored once. ``mode`` picks the link: ``reflink``
+    (copy-on-write, the copies stay independent), ``hardlink`` (one inode,
+    works on any local filesystem) or ``auto``, a reflink where supported
+    and a hardlink otherwise. Files smaller than ``min_size`` are ignored.
+    """
+
+    def __init__(self, path: str, mode: str = "auto", min_size: int = 64 * 1024):
+        if mode not in LINK_MODES:
+            raise ValueError(f"mode must be one of {', '.join(LINK_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.min_size = min_size
+        self.saved_bytes = 0
+        self.logger = logging.getLogger("DedupIndex")
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY,"
+                " digest TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " indexed_at REAL NOT NULL"
+                ")"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS files_digest ON files (digest, size)")
+
+    def deduplicate(self, filename: str, digest: Optional[str] = None) -> Optional[str]:
+        """Index a finished file, linking it to an identical one if there is one.
+
+        ``digest`` is the file's SHA-256 if it is already known. Returns the
+        path of the file it now shares its data with, or None.
+        """
+        filename = os.path.abspath(filename)
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+        if stat.st_size < self.min_size:
+            return None
+
+        digest = digest or hash_file(filename)
+        for original in self._candidates(digest, stat.st_size):
+            if original == filename:
+                continue
+            if os.path.samefile(original, filename):
+                # Already linked, e.g. downloaded again over the link
+                self._record(filename, digest, os.stat(filename))
+                return original
+            try:
+                kind = link_duplicate(original, filename, self.mode)
+            except OSError as e:
+                self.logger.warning(f"Could not link {os.path.basename(filename)} to {original}: {e}")
+                continue
+            if kind:
+                self._record(filename, digest, os.stat(filename))
+                with self._lock:
+                    self.saved_bytes += stat.st_size
+                self.logger.info(f"Deduplicated {os.path.basename(filename)} ({kind} to {original})")
+                return original
+
+        self._record(filename, digest, stat)
+        return None
+
+    def _candidates(self, digest: str, size: int):
+        """Yield indexed files with this content that are still unchanged on disk."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime_ns FROM files WHERE digest = ? AND size = ? ORDER BY indexed_at",
+                (digest, size)
+            ).fetchall()
+        for path, mtime_ns in rows:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is None or stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                # Deleted or rewritten since it was indexed
+                self._forget(path)
+                continue
+            yield path
+
+    def _record(self, path: str, digest: str, stat: os.stat_result):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, digest, size, mtime_ns, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                (path, digest, stat.st_size, stat.st_mtime_ns, time.time())
+            )
+
+    def _forget(self, path: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
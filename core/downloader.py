@@ -1,138 +1,792 @@
 """Main video downloader implementation."""
 
+import contextlib
+import dataclasses
+import functools
+import hashlib
 import logging
 import os
-from typing import Optional
-from urllib.parse import urlparse
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-try:
-    from yt_dlp import YoutubeDL
-except ImportError:
-    raise ImportError("yt-dlp is required. Install with: pip install yt-dlp")
-
-from ..models import DownloadConfig
+from ..models import ContentType, DownloadConfig, DownloadResult, DownloadStatus
 from ..platforms import AVAILABLE_PLATFORMS
 from ..ui.base import UIManager
+from ..utils.files import move_files
 from .base import Platform
-from .progress import ProgressHandler
+from .errors import REASON_POLICIES, RETRY_POLICIES, Diagnosis, ErrorClass, RetryPolicy, classify
+from .info_cache import InfoCache
+from .playlist import entry_url, iter_entries
+from .router import Classification, PlatformRouter
+from .ydl_logger import YDLLogger
+from .ydl_pool import YDLPool
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+    from .archive import DownloadArchive
+    from .bandwidth import BandwidthScheduler
+    from .dedup import DedupIndex
+    from .integrity import IntegrityChecker
+    from .metrics import DownloadMetrics, JobMetrics
+    from .postprocess import PostProcessingStage
+
+def _yt_dlp():
+    """Import yt-dlp on first use, it dominates the start-up time."""
+    try:
+        import yt_dlp
+        import yt_dlp.utils
+    except ImportError:
+        raise ImportError("yt-dlp is required. Install with: pip install yt-dlp")
+    return yt_dlp
 
 class VideoDownloader:
-    def __init__(self, ui_manager: UIManager):
+    # Archived entries in a row after which a channel sync stops listing
+    SYNC_STOP_AFTER_KNOWN = 10
+    
+    # Explanations shown for failures, keyed by Diagnosis.reason
+    ERROR_HELP = {
+        "ssl": (
+            "🔒 SSL Certificate Error\n\n"
+            "This is usually caused by network configuration or outdated certificates.\n\n"
+            "💡 Solutions:\n"
+            "• Update yt-dlp: pip install --upgrade yt-dlp\n"
+            "• Check your internet connection\n"
+            "• Try again in a few minutes\n\n"
+            "Note: SSL verification has been disabled for this download."
+        ),
+        "format_unavailable": (
+            "🎯 Format Not Available\n\n"
+            "The requested video quality is not available.\n\n"
+            "💡 Try:\n"
+            "• Lower quality setting (720p or 480p)\n"
+            "• 'Best' quality option\n"
+            "• Audio-only download"
+        ),
+        "forbidden": (
+            "🚫 Access Denied (403)\n\n"
+            "The video may be:\n"
+            "• Geo-blocked in your region\n"
+            "• Requires authentication\n"
+            "• Private or restricted\n"
+            "• Protected by the platform"
+        ),
+        "throttled": "🐢 Rate Limited\n\nThe platform is throttling requests. Try again later or lower the concurrency.",
+        "private": "🔒 Private Video\n\nThis video is private and cannot be downloaded.",
+        "unavailable": "📺 Video Unavailable\n\nThe video has been removed or is no longer available.",
+        "age_restricted": "🔞 Age-Restricted Content\n\nThis video requires age verification and cannot be downloaded without authentication.",
+        "copyright": "©️ Copyright Protected\n\nThis video is protected by copyright restrictions.",
+        "incomplete": "✂️ Incomplete Download\n\nThe file arrived truncated or unplayable and was discarded. It is downloaded again automatically.",
+    }
+    
+    def __init__(self, ui_manager: UIManager, archive: Optional["DownloadArchive"] = None,
+                 info_cache: Optional[InfoCache] = None,
+                 postprocessing: Optional["PostProcessingStage"] = None,
+                 metrics: Optional["DownloadMetrics"] = None,
+                 bandwidth: Optional["BandwidthScheduler"] = None,
+                 retry_policies: Optional[Dict[ErrorClass, RetryPolicy]] = None,
+                 ydl_pool: Optional[YDLPool] = None,
+                 dedup: Optional["DedupIndex"] = None,
+                 integrity: Optional["IntegrityChecker"] = None):
         self.ui_manager = ui_manager
-        self.platforms = [platform_class() for platform_class in AVAILABLE_PLATFORMS]
+        self.archive = archive
+        self.info_cache = info_cache
+        self.postprocessing = postprocessing
+        self.metrics = metrics
+        self.bandwidth = bandwidth
+        self.retry_policies = RETRY_POLICIES if retry_policies is None else retry_policies
+        self.ydl_pool = YDLPool() if ydl_pool is None else ydl_pool
+        self.dedup = dedup
+        self.integrity = integrity
         self.logger = logging.getLogger("VideoDownloader")
         self.downloaded_files = []
+        # Scratch directories of running jobs, each used by one job at a time
+        self._scratch_in_use: Set[str] = set()
+        self._scratch_lock = threading.Lock()
+    
+    @functools.cached_property
+    def platforms(self) -> List[Platform]:
+        """Platform handlers, created when first needed."""
+        return [platform_class() for platform_class in AVAILABLE_PLATFORMS]
+    
+    @functools.cached_property
+    def retry_sleep_functions(self) -> Dict[str, Callable[..., float]]:
+        """Jittered backoff for yt-dlp's own HTTP and fragment retries."""
+        # Created once so that pooled YoutubeDL instances keep matching
+        transient = self.retry_policy(Diagnosis(ErrorClass.TRANSIENT, "network")).sleep_function()
+        return {"http": transient, "fragment": transient}
+    
+    @functools.cached_property
+    def router(self) -> PlatformRouter:
+        """Router over :attr:`platforms`."""
+        return PlatformRouter(self.platforms)
+    
+    def register_platform(self, platform: Platform):
+        """Add a platform handler next to the built-in ones."""
+        self.platforms.append(platform)
+        self.router.register(platform)
     
     def detect_platform(self, url: str) -> Optional[Platform]:
         """Detect which platform a URL belongs to."""
         try:
-            parsed = urlparse(url)
-            if parsed.scheme not in {"http", "https"}:
-                return None
-            
-            for platform in self.platforms:
-                if platform.validate_url(url):
-                    return platform
-            
-            return None
+            return self.router.route(url)
         except Exception as e:
             self.logger.error(f"Error detecting platform for {url}: {e}")
             return None
     
-    def _success_hook(self, d):
+    def classify_many(self, urls: Iterable[str]) -> Iterator[Classification]:
+        """Detect platform and content type for many URLs at once."""
+        return self.router.classify_many(urls)
+    
+    def close(self):
+        """Close the pooled YoutubeDL instances, saving their cookies."""
+        self.ydl_pool.close()
+    
+    def _success_hook(self, result: DownloadResult, preset: str, deferred: List[Dict],
+                      job_metrics: Optional["JobMetrics"], d):
         """Hook to track successfully downloaded files."""
         if d['status'] == 'finished':
             filename = d.get('filename')
+            if filename and self.integrity and not d.get('sink'):
+                self._verify_download(filename, d.get('info_dict') or {})
             if filename:
-                self.downloaded_files.append(filename)
+                result.files.append(filename)
                 self.logger.info(f"Successfully downloaded: {os.path.basename(filename)}")
+                
+                media_id = (d.get('info_dict') or {}).get('id')
+                if self.archive and media_id:
+                    recorded = None
+                    if not deferred and not result.staging:
+                        # Already in its place, recorded right away to survive a crash
+                        self.archive.record(result.platform, media_id, preset, filename)
+                        recorded = filename
+                    # Otherwise recorded once the file reached the output directory
+                    result.archived.append((recorded, filename, media_id, preset))
+    
+    def _postprocess_hook(self, result: DownloadResult, deferred: List[Dict], job_metrics: Optional["JobMetrics"],
+                          filename: str):
+        """yt-dlp post hook handing a file to the post-processing stage once yt-dlp is done with it."""
+        # Runs after yt-dlp's own fixups, which rewrite the file the progress hook reported
+        future = self.postprocessing.submit(filename, deferred)
+        result.postprocessing.append((filename, future))
+        if job_metrics:
+            job_metrics.deferred(future)
+    
+    def _verify_download(self, filename: str, info: Dict):
+        """Probe a file yt-dlp reports as finished, discarding it if it is incomplete."""
+        problem = self.integrity.check(filename, info.get('duration'))
+        if not problem:
+            return
+        self.logger.warning(f"Discarding {os.path.basename(filename)}: {problem}")
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(filename)
+        # Aborts the download; the error classifies as transient so the URL is retried
+        raise _yt_dlp().utils.DownloadError(f"Incomplete download of {os.path.basename(filename)}: {problem}")
+    
+    def _finish_postprocessing(self, result: DownloadResult) -> bool:
+        """Wait for deferred post-processing, swap in the final filenames, record and deduplicate them."""
+        if result.postprocessing:
+            renamed, errors = self.postprocessing.wait(result.postprocessing)
+            result.postprocessing = []
+            self._rename_files(result, renamed)
+            if errors:
+                self._release_scratch(result)
+                result.status = DownloadStatus.FAILED
+                result.error = f"Post-processing failed: {errors[0]}"
+                return False
+        if result.staging:
+            try:
+                self._move_from_scratch(result)
+            except OSError as e:
+                # Nothing is archived, the media is downloaded again next time
+                self.logger.error(f"Could not move the files of {result.url} to the output directory: {e}")
+                result.status = DownloadStatus.FAILED
+                result.error = f"Could not move the finished files to the output directory: {e}"
+                return False
+            finally:
+                self._release_scratch(result)
+        if self.archive:
+            for recorded, filename, media_id, preset in result.archived:
+                if filename != recorded:
+                    self.archive.record(result.platform, media_id, preset, filename)
+            result.archived = []
+        if self.integrity or self.dedup:
+            self._store_files(result)
+        return True
+    
+    @staticmethod
+    def _rename_files(result: DownloadResult, renamed: Dict[str, str]):
+        """Swap in new names of the result's files, e.g. after post-processing or a move."""
+        result.files = [renamed.get(f, f) for f in result.files]
+        for entry in result.entries:
+            entry.files = [renamed.get(f, f) for f in entry.files]
+        result.archived = [(recorded, renamed.get(filename, filename), media_id, preset)
+                           for recorded, filename, media_id, preset in result.archived]
+    
+    def _move_from_scratch(self, result: DownloadResult):
+        """Move finished files from the scratch directory into the output directory."""
+        scratch, output_dir = result.staging
+        moves = {}
+        for filename in result.files + [f for entry in result.entries for f in entry.files]:
+            relative = os.path.relpath(filename, scratch)
+            if os.path.isfile(filename) and not relative.startswith(os.pardir):
+                moves[filename] = os.path.join(output_dir, relative)
+        move_files(moves.items())
+        self._rename_files(result, moves)
+        # Whatever is left are leftovers of yt-dlp, e.g. the parts of merged formats
+        shutil.rmtree(scratch, ignore_errors=True)
+    
+    def _claim_scratch(self, scratch_dir: str, url: str, preset: str) -> str:
+        """Return the scratch directory of a job, one no running job uses.
+        
+        The name derives from the URL and preset, so a retry or the next run
+        resumes the parts left behind; concurrent jobs for the same media
+        get a numbered sibling.
+        """
+        base = os.path.join(scratch_dir, hashlib.sha1(f"{url}\n{preset}".encode("utf-8")).hexdigest()[:16])
+        with self._scratch_lock:
+            scratch, number = base, 1
+            while scratch in self._scratch_in_use:
+                number += 1
+                scratch = f"{base}-{number}"
+            self._scratch_in_use.add(scratch)
+        return scratch
+    
+    def _release_scratch(self, result: DownloadResult):
+        """Give up a job's claim on its scratch directory, leaving its contents for a resume."""
+        if result.staging:
+            with self._scratch_lock:
+                self._scratch_in_use.discard(result.staging[0])
+            result.staging = None
+    
+    def _store_files(self, result: DownloadResult):
+        """Add final files to their manifest and link them to identical ones downloaded before."""
+        files = dict.fromkeys(result.files + [f for entry in result.entries for f in entry.files])
+        for filename in files:
+            if not os.path.isfile(filename):
+                # Streamed to a sink
+                continue
+            try:
+                digest = self.integrity.record(filename)["sha256"] if self.integrity else None
+                if self.dedup:
+                    self.dedup.deduplicate(filename, digest)
+            except OSError as e:
+                # The download itself succeeded, this only costs space or a manifest line
+                self.logger.warning(f"Could not index {os.path.basename(filename)}: {e}")
+    
+    def _cancel_hook(self, cancelled: threading.Event, d):
+        """Abort the running download once cancellation was requested."""
+        if cancelled.is_set():
+            raise _yt_dlp().utils.DownloadCancelled("Download cancelled")
+    
+    def _archive_filter(self, platform_name: str, preset: str, rejected: List[str], info, *,
+                        incomplete: bool = False):
+        """yt-dlp match filter skipping entries that are already archived, collecting their ids in ``rejected``."""
+        media_id = info.get('id')
+        if media_id and self.archive.contains(platform_name, media_id, preset):
+            rejected.append(media_id)
+            return f"{media_id} is already in the download archive"
+        return None
+    
+    def retry_policy(self, diagnosis: Diagnosis) -> RetryPolicy:
+        """Return the retry policy for a classified failure."""
+        if diagnosis.reason in REASON_POLICIES:
+            return REASON_POLICIES[diagnosis.reason]
+        return self.retry_policies.get(diagnosis.error_class, RetryPolicy(attempts=1))
+    
+    def retry_delay(self, result: DownloadResult, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a result after ``attempt`` tries, None to give up."""
+        if result.status != DownloadStatus.FAILED or result.postprocessing:
+            return None
+        policy = self.retry_policy(classify(result.error))
+        if not policy.should_retry(attempt):
+            return None
+        return policy.delay(attempt)
     
     def download(self, url: str, config: DownloadConfig) -> bool:
         """Download content from the given URL with enhanced UI feedback."""
+        # Reset downloaded files list
+        self.downloaded_files = []
+        attempt = 1
+        result = self._download_one(url, config)
+        delay = self.retry_delay(result, attempt)
+        while delay is not None:
+            attempt += 1
+            self.ui_manager.show_info(f"Retrying in {delay:.0f}s (attempt {attempt})...")
+            time.sleep(delay)
+            result = self._download_one(url, config)
+            delay = self.retry_delay(result, attempt)
+        self.downloaded_files = result.files
+        return result.ok
+    
+    def download_many(self, urls: Iterable[str], config: DownloadConfig, max_workers: int = 4,
+                      platform_limits: Optional[Dict[str, int]] = None,
+                      adaptive: bool = False) -> List[DownloadResult]:
+        """Download many URLs concurrently and return one result per URL.
+        
+        Results are returned in completion order. ``platform_limits`` maps a
+        platform name (e.g. ``"Instagram"``) to its maximum concurrency, and
+        ``adaptive`` adjusts the concurrency to how each platform copes.
+        """
+        from .batch import BatchDownloader
+        batch = BatchDownloader(self, max_workers=max_workers, platform_limits=platform_limits,
+                                adaptive=adaptive)
+        return list(batch.run(urls, config))
+    
+    def _download_one(self, url: str, config: DownloadConfig, report: bool = True,
+                      hooks: Optional[List[Callable]] = None,
+                      postprocessor_hooks: Optional[List[Callable]] = None,
+                      cancelled: Optional[threading.Event] = None,
+                      wait_postprocessing: bool = True) -> DownloadResult:
+        """Download a single URL and describe the outcome.
+        
+        When ``report`` is False nothing is sent to the UI manager, which
+        keeps the method safe to call from several worker threads at once.
+        Extra yt-dlp progress and post-processor hooks can be passed in, and
+        setting ``cancelled`` aborts the download at the next progress tick.
+        With ``wait_postprocessing`` False the result is returned while
+        deferred post-processing is still running (see ``result.postprocessing``).
+        """
+        # Only downloads pay for yt-dlp, sqlite and the progress display
+        from .archive import DownloadArchive
+        from .progress import ProgressHandler
+        started = time.monotonic()
+        yt_dlp = _yt_dlp()
         platform = self.detect_platform(url)
         if not platform:
-            self.ui_manager.show_error("Invalid or unsupported URL")
-            return False
+            if report:
+                self.ui_manager.show_error("Invalid or unsupported URL")
+            result = DownloadResult(url, DownloadStatus.UNSUPPORTED, error="Invalid or unsupported URL")
+            if self.metrics:
+                self.metrics.job("unknown").finish(result)
+            return result
         
         # Enhanced platform detection display
         content_type = platform.classify_content(url)
-        if hasattr(self.ui_manager, 'show_platform_detection'):
-            self.ui_manager.show_platform_detection(platform.info.name, content_type)
-        else:
-            self.ui_manager.show_info(f"Detected platform: {platform.info.name}")
+        if report:
+            if hasattr(self.ui_manager, 'show_platform_detection'):
+                self.ui_manager.show_platform_detection(platform.info.name, content_type)
+            else:
+                self.ui_manager.show_info(f"Detected platform: {platform.info.name}")
         
-        ydl_opts = platform.get_ydl_options(config, content_type)
+        result = DownloadResult(url, DownloadStatus.FAILED, platform=platform.info.name,
+                                content_type=content_type)
+        job_metrics = self.metrics.job(platform.info.name) if self.metrics else None
         
-        # Reset downloaded files list
-        self.downloaded_files = []
+        # Skip media we already have without touching the network
+        preset = DownloadArchive.preset_of(config)
+        if self.archive and content_type == ContentType.VIDEO:
+            media_id = platform.extract_media_id(url)
+            if media_id and self.archive.contains(platform.info.name, media_id, preset):
+                result.status = DownloadStatus.SKIPPED
+                result.error = "Already downloaded (found in archive)"
+                if report:
+                    self.ui_manager.show_info(result.error)
+                result.elapsed = time.monotonic() - started
+                if job_metrics:
+                    job_metrics.finish(result)
+                return result
+        
+        ydl_config = config
+        if config.scratch_dir:
+            # yt-dlp writes parts, fragments and merges in the scratch directory,
+            # the finished files move to output_dir once post-processing is done
+            scratch = self._claim_scratch(config.scratch_dir, url, preset)
+            ydl_config = dataclasses.replace(config, output_dir=scratch)
+            result.staging = (scratch, config.output_dir)
+        ydl_opts = platform.get_ydl_options(ydl_config, content_type)
+        archived: List[str] = []
+        if self.archive:
+            ydl_opts["match_filter"] = functools.partial(self._archive_filter, platform.info.name, preset, archived)
+        
+        # Streamed media never lands on disk, so there is nothing to post-process
+        deferred = self.postprocessing.split(ydl_opts) if self.postprocessing and config.sink is None else []
+        if deferred:
+            ydl_opts["post_hooks"] = [functools.partial(self._postprocess_hook, result, deferred, job_metrics)]
         
         # Add progress and success hooks
-        progress_handler = ProgressHandler(self.ui_manager)
-        ydl_opts["progress_hooks"] = [progress_handler, self._success_hook]
+        progress_hooks = [functools.partial(self._success_hook, result, preset, deferred, job_metrics)]
+        if report:
+            progress_handler = ProgressHandler(self.ui_manager)
+            progress_hooks.insert(0, progress_handler)
+        else:
+            progress_handler = contextlib.nullcontext()
+        if cancelled is not None:
+            progress_hooks.insert(0, functools.partial(self._cancel_hook, cancelled))
+        if self.bandwidth and self.bandwidth.enabled:
+            progress_hooks.append(self.bandwidth.hook(platform.info.name))
+        postprocessor_hooks = list(postprocessor_hooks or [])
+        if job_metrics:
+            progress_hooks.append(job_metrics.progress_hook)
+            postprocessor_hooks.append(job_metrics.postprocessor_hook)
+        # Keeps yt-dlp's errors for the result; retries are only reported as log messages
+        ydl_logger = YDLLogger(on_retry=job_metrics.retry if job_metrics else None)
+        ydl_opts["logger"] = ydl_logger
+        ydl_opts.setdefault("retry_sleep_functions", self.retry_sleep_functions)
+        ydl_opts["progress_hooks"] = progress_hooks + list(hooks or [])
+        if any(isinstance(hook, ProgressHandler) and hook.progress for hook in ydl_opts["progress_hooks"]):
+            # Our own progress bars replace yt-dlp's console progress lines
+            ydl_opts["noprogress"] = True
+        if postprocessor_hooks:
+            ydl_opts["postprocessor_hooks"] = postprocessor_hooks
         
         try:
-            self.ui_manager.show_info("Starting download...")
+            if cancelled is not None and cancelled.is_set():
+                raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+            
+            if report:
+                self.ui_manager.show_info("Starting download...")
             
+            newest, staged = None, None
             with progress_handler:
-                with YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([url])
+                if config.sink is None or not self._stream(url, ydl_opts, ydl_config, result):
+                    if config.sink is not None:
+                        # Not streamable: download to disk, then hand the final files to the sink
+                        staged = []
+                        ydl_opts["post_hooks"] = [staged.append]
+                        os.makedirs(ydl_config.output_dir, exist_ok=True)
+                    if content_type != ContentType.VIDEO and (
+                            config.playlist_workers > 1 or (content_type == ContentType.CHANNEL and self.archive)):
+                        newest = self._fan_out(url, platform, ydl_opts, preset, config.playlist_workers, result)
+                    else:
+                        with self.ydl_pool.checkout(ydl_opts) as ydl:
+                            self._run_ydl(ydl, url, platform, content_type, result)
+            if staged is not None and result.files:
+                self._store_staged(staged, ydl_config, result)
             
             # Enhanced success reporting
-            if self.downloaded_files:
-                file_names = [os.path.basename(f) for f in self.downloaded_files]
-                success_msg = f"Downloaded {len(file_names)} file(s): {', '.join(file_names)}"
-                self.ui_manager.show_success(success_msg)
-                return True
+            if result.files:
+                result.status = DownloadStatus.SUCCESS
+                if wait_postprocessing or not result.postprocessing:
+                    self._finish_postprocessing(result)
+                if report and result.ok:
+                    file_names = [os.path.basename(f) for f in result.files]
+                    success_msg = f"Downloaded {len(file_names)} file(s): {', '.join(file_names)}"
+                    self.ui_manager.show_success(success_msg)
+                elif report:
+                    self.ui_manager.show_error(result.error)
+            elif newest and not result.entries:
+                result.status = DownloadStatus.SKIPPED
+                result.error = "No new uploads since the last sync"
+                if report:
+                    self.ui_manager.show_info(result.error)
+            elif result.entries and all(entry.ok for entry in result.entries):
+                result.status = DownloadStatus.SKIPPED
+                result.error = "All entries were already downloaded"
+                if report:
+                    self.ui_manager.show_info(result.error)
+            elif archived and not result.entries and not ydl_logger.last_error:
+                # URLs without an id in them are only recognised once yt-dlp extracted the media
+                result.status = DownloadStatus.SKIPPED
+                result.error = ("Already downloaded (found in archive)" if content_type == ContentType.VIDEO
+                                else "All entries were already downloaded")
+                if report:
+                    self.ui_manager.show_info(result.error)
             else:
-                self.ui_manager.show_error("Download process completed but no files were downloaded. The video may be unavailable or restricted.")
-                return False
+                result.error = (ydl_logger.last_error
+                                or "Download process completed but no files were downloaded. The video may be unavailable or restricted.")
+                if report:
+                    self._show_download_error(result.error)
             
-        except Exception as e:
-            error_msg = str(e).lower()
+            # Only a complete sync may move the watermark, or failed uploads would be skipped next time
+            if newest and result.ok and all(entry.ok for entry in result.entries):
+                newest_id, newest_entry = newest
+                self.archive.set_watermark(platform.info.name, self._channel_key(url), preset,
+                                           newest_id, newest_entry.get('upload_date'))
             
-            # Enhanced error handling with specific messages
-            if any(ssl_err in error_msg for ssl_err in ["ssl", "certificate", "cert_verify", "unable to get local issuer"]):
-                self.ui_manager.show_error(
-                    "🔒 SSL Certificate Error\n\n"
-                    "This is usually caused by network configuration or outdated certificates.\n\n"
-                    "💡 Solutions:\n"
-                    "• Update yt-dlp: pip install --upgrade yt-dlp\n"
-                    "• Check your internet connection\n"
-                    "• Try again in a few minutes\n\n"
-                    "Note: SSL verification has been disabled for this download."
-                )
-            elif "requested format is not available" in error_msg:
-                self.ui_manager.show_error(
-                    "🎯 Format Not Available\n\n"
-                    "The requested video quality is not available.\n\n"
-                    "💡 Try:\n"
-                    "• Lower quality setting (720p or 480p)\n"
-                    "• 'Best' quality option\n"
-                    "• Audio-only download"
-                )
-            elif "http error 403" in error_msg:
-                self.ui_manager.show_error(
-                    "🚫 Access Denied (403)\n\n"
-                    "The video may be:\n"
-                    "• Geo-blocked in your region\n"
-                    "• Requires authentication\n"
-                    "• Private or restricted\n"
-                    "• Protected by the platform"
-                )
-            elif "private video" in error_msg:
-                self.ui_manager.show_error("🔒 Private Video\n\nThis video is private and cannot be downloaded.")
-            elif "video unavailable" in error_msg:
-                self.ui_manager.show_error("📺 Video Unavailable\n\nThe video has been removed or is no longer available.")
-            elif "age-restricted" in error_msg:
-                self.ui_manager.show_error("🔞 Age-Restricted Content\n\nThis video requires age verification and cannot be downloaded without authentication.")
-            elif "copyright" in error_msg:
-                self.ui_manager.show_error("©️ Copyright Protected\n\nThis video is protected by copyright restrictions.")
+        except yt_dlp.utils.DownloadCancelled as e:
+            result.status = DownloadStatus.CANCELLED
+            result.error = str(e)
+            self.logger.info(f"Download cancelled for {url}")
+            if report:
+                self.ui_manager.show_info("Download cancelled")
+        except Exception as e:
+            # Also when the files were downloaded but could not be finished
+            result.status = DownloadStatus.FAILED
+            result.error = str(e)
+            self.logger.error(f"Download failed for {url}: {e}")
+            if report:
+                self._show_download_error(result.error)
+        
+        if not result.postprocessing:
+            # Finished or failed; with deferred post-processing _finish_postprocessing releases it
+            self._release_scratch(result)
+        if report and result.entries:
+            self._show_entry_summary(result)
+        result.elapsed = time.monotonic() - started
+        if job_metrics:
+            job_metrics.finish(result)
+        return result
+    
+    @staticmethod
+    def _channel_key(url: str) -> str:
+        return url.strip().rstrip('/')
+    
+    def _fan_out(self, url: str, platform: Platform, ydl_opts: Dict, preset: str, workers: int,
+                 result: DownloadResult) -> Optional[Tuple[str, Dict]]:
+        """Enumerate a playlist or channel flat and download its entries concurrently.
+        
+        Entries are listed lazily and at most ``2 * workers`` of them wait in
+        the pool at a time. Each entry checks out its own YoutubeDL instance,
+        which is not thread-safe, and its outcome is added to ``result.entries``.
+        
+        Channels with an archive are synced incrementally: listing a tab
+        stops at the watermark left by the previous sync, at an upload older
+        than it, or after :attr:`SYNC_STOP_AFTER_KNOWN` archived entries in
+        a row, and goes on with the channel's next tab.
+        Returns the media id and entry of the newest upload of a synced
+        channel, None otherwise.
+        """
+        yt_dlp = _yt_dlp()
+        flat_opts = {key: value for key, value in ydl_opts.items()
+                     if key not in ("progress_hooks", "postprocessor_hooks", "postprocessors", "match_filter")}
+        flat_opts["extract_flat"] = "in_playlist"
+        # Errors must reach the entry's result instead of being logged and skipped
+        entry_opts = dict(ydl_opts, ignoreerrors=False)
+        
+        def is_collection(entry_url: str) -> bool:
+            return platform.validate_url(entry_url) and platform.classify_content(entry_url) != ContentType.VIDEO
+        
+        sync = self.archive is not None and result.content_type == ContentType.CHANNEL
+        watermark = self.archive.watermark(platform.info.name, self._channel_key(url), preset) if sync else None
+        newest, known_run = None, 0
+        # Set to end the tab being listed; iter_entries moves on to the next one
+        stop_tab = False
+        
+        def skip_rest() -> bool:
+            nonlocal stop_tab, known_run
+            if not stop_tab:
+                return False
+            stop_tab, known_run = False, 0
+            return True
+        
+        submitted, pending = [], set()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="playlist")
+        try:
+            with self.ydl_pool.checkout(flat_opts) as flat_ydl:
+                for entry, extra in iter_entries(flat_ydl, url, is_collection, skip_rest=skip_rest):
+                    media_id = entry.get('id') or platform.extract_media_id(entry_url(entry) or "")
+                    if sync and newest is None and media_id:
+                        newest = (media_id, entry)
+                    if watermark:
+                        watermark_id, watermark_date = watermark
+                        upload_date = entry.get('upload_date')
+                        if media_id == watermark_id or (watermark_date and upload_date and upload_date < watermark_date):
+                            self.logger.info(f"Reached uploads already synced from {extra.get('playlist_title') or url}")
+                            stop_tab = True
+                            continue
+                    
+                    known = bool(self.archive and media_id and self.archive.contains(platform.info.name, media_id, preset))
+                    known_run = known_run + 1 if known else 0
+                    if watermark and known_run >= self.SYNC_STOP_AFTER_KNOWN:
+                        self.logger.info(f"Stopped listing {extra.get('playlist_title') or url} "
+                                         f"after {known_run} archived entries in a row")
+                        stop_tab = True
+                    
+                    entry_result = DownloadResult(entry_url(entry) or url, DownloadStatus.FAILED,
+                                                  platform=platform.info.name, content_type=ContentType.VIDEO)
+                    result.entries.append(entry_result)
+                    if known:
+                        entry_result.status = DownloadStatus.SKIPPED
+                        entry_result.error = "Already downloaded (found in archive)"
+                        continue
+                    
+                    future = executor.submit(self._download_entry, entry, extra, entry_opts, preset, entry_result)
+                    submitted.append((future, entry_result))
+                    pending.add(future)
+                    if len(pending) >= 2 * workers:
+                        _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    if any(e.status == DownloadStatus.CANCELLED for _, e in submitted):
+                        break
+            wait(pending)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        for future, entry_result in submitted:
+            if future.cancelled():
+                entry_result.status = DownloadStatus.CANCELLED
+                entry_result.error = "Download cancelled"
+        if any(entry.status == DownloadStatus.CANCELLED for entry in result.entries):
+            raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+        return newest
+    
+    def _download_entry(self, entry: Dict, extra: Dict, ydl_opts: Dict, preset: str, result: DownloadResult):
+        """Download one flat playlist entry, keeping its playlist fields for naming."""
+        yt_dlp = _yt_dlp()
+        started = time.monotonic()
+        opts = dict(ydl_opts)
+        opts["progress_hooks"] = list(ydl_opts.get("progress_hooks", [])) + [
+            functools.partial(self._entry_hook, result)]
+        try:
+            with self.ydl_pool.checkout(opts) as ydl:
+                # Resolves URL entries, keeping the metadata a transparent entry carries
+                info = ydl.process_ie_result(entry, download=True, extra_info=extra)
+            if info and not entry.get('upload_date'):
+                # Flat entries often lack the date the channel watermark keeps
+                entry['upload_date'] = info.get('upload_date')
+            if result.files:
+                result.status = DownloadStatus.SUCCESS
+            elif self.archive and info and info.get('id') and self.archive.contains(result.platform, info['id'], preset):
+                # Rejected by the archive match filter
+                result.status = DownloadStatus.SKIPPED
+                result.error = "Already downloaded (found in archive)"
             else:
-                self.ui_manager.show_error(f"Download failed: {str(e)}")
-                if hasattr(self.ui_manager, 'show_info'):
-                    self.ui_manager.show_info("💡 For SSL/certificate errors, try: pip install --upgrade yt-dlp")
-            
-            return False
+                result.error = "No file was downloaded"
+        except yt_dlp.utils.DownloadCancelled as e:
+            result.status = DownloadStatus.CANCELLED
+            result.error = str(e)
+        except Exception as e:
+            result.error = str(e)
+            self.logger.error(f"Playlist entry {result.url} failed: {e}")
+        result.elapsed = time.monotonic() - started
+    
+    def _entry_hook(self, result: DownloadResult, d):
+        """Track the files of a single playlist entry."""
+        if d['status'] == 'finished' and d.get('filename'):
+            result.files.append(d['filename'])
+    
+    def _show_entry_summary(self, result: DownloadResult):
+        """Report how the entries of a playlist or channel went."""
+        counts = {}
+        for entry in result.entries:
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+        summary = ", ".join(f"{count} {status.value}" for status, count in counts.items())
+        self.ui_manager.show_info(f"{len(result.entries)} entries: {summary}")
+        for entry in result.entries:
+            if entry.status == DownloadStatus.FAILED:
+                self.ui_manager.show_error(f"{entry.url}: {entry.error}")
+    
+    def _stream(self, url: str, ydl_opts: Dict, config: DownloadConfig, result: DownloadResult) -> bool:
+        """Pipe a single progressive format into ``config.sink`` as it downloads.
+        
+        The regular progress hooks see the usual ``downloading`` and
+        ``finished`` events; the latter carries the sink and reports the
+        location it returned. Returns False, without downloading anything,
+        when the media is not a single progressive file and the sink takes
+        finished files instead.
+        """
+        from yt_dlp.networking import Request
+        from .sinks import STREAM_CHUNK_SIZE, streamable_format
+        yt_dlp = _yt_dlp()
+        sink = config.sink
+        if result.content_type != ContentType.VIDEO:
+            if sink.stores_files:
+                return False
+            raise yt_dlp.utils.DownloadError("Playlists and channels cannot be streamed, only single videos")
+        
+        opts = {key: value for key, value in ydl_opts.items() if key not in ("postprocessors", "post_hooks")}
+        if not sink.stores_files:
+            # Anything streamable beats nothing; storage sinks rather fall back to the requested quality
+            opts["format"] = streamable_format(ydl_opts.get("format") or "best")
+            # Media without a progressive format is reported below rather than as a missing format
+            opts["ignore_no_formats_error"] = True
+        hooks = ydl_opts.get("progress_hooks", [])
+        with self.ydl_pool.checkout(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            if not info:
+                # Rejected by the archive match filter or failed, the logger has the reason
+                return True
+            single = not info.get('requested_formats') and info.get('protocol') in ('http', 'https')
+            # Storage keeps post-processed files; a stream delivers the media as it is
+            if not single or (sink.stores_files and ydl_opts.get("postprocessors")):
+                if sink.stores_files:
+                    return False
+                protocols = sorted({f['protocol'] for f in info.get('formats') or [] if f.get('protocol')})
+                raise yt_dlp.utils.DownloadError(
+                    "This media cannot be streamed, it is not a single progressive file"
+                    + (f" (available as {', '.join(protocols)})" if protocols else ""))
+            name = os.path.relpath(ydl.prepare_filename(info), config.output_dir)
+            response = ydl.urlopen(Request(info['url'], headers=info.get('http_headers') or {}))
+            total = int(response.headers.get('Content-Length') or 0) or info.get('filesize')
+            progress = {'status': 'downloading', 'filename': name, 'tmpfilename': name, 'info_dict': info,
+                        'downloaded_bytes': 0, 'total_bytes': total}
+            started = time.monotonic()
+            delivered = False
+            writer = sink.open(name, info)
+            try:
+                with response:
+                    while True:
+                        chunk = response.read(STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        delivered = True
+                        writer.write(chunk)
+                        elapsed = time.monotonic() - started
+                        downloaded = progress['downloaded_bytes'] + len(chunk)
+                        speed = downloaded / elapsed if elapsed > 0 else None
+                        progress.update(downloaded_bytes=downloaded, elapsed=elapsed, speed=speed,
+                                        eta=(total - downloaded) / speed if total and speed else None)
+                        for hook in hooks:
+                            hook(dict(progress))
+                # Finishing can fail too (completing a multipart upload), leaving nothing behind
+                location = writer.close()
+            except BaseException as e:
+                writer.abort()
+                if delivered and not sink.stores_files and not isinstance(e, yt_dlp.utils.DownloadCancelled):
+                    # The consumer already has part of the file, starting over would corrupt it
+                    raise yt_dlp.utils.DownloadError(
+                        f"Stream interrupted after {progress['downloaded_bytes']} bytes: {e}") from e
+                raise
+        
+        finished = dict(progress, status='finished', filename=location or name, sink=sink)
+        for hook in hooks:
+            hook(finished)
+        return True
+    
+    def _store_staged(self, staged: List[str], config: DownloadConfig, result: DownloadResult):
+        """Hand files downloaded to disk over to the sink and report their new locations."""
+        stored = {}
+        for path in dict.fromkeys(staged):
+            if os.path.isfile(path):
+                stored[path] = config.sink.store(path, os.path.relpath(path, config.output_dir))
+                self.logger.info(f"Stored {os.path.basename(path)} at {stored[path]}")
+        # yt-dlp's post-processors change the extension but keep the name
+        by_stem = {os.path.splitext(path)[0]: location for path, location in stored.items()}
+        result.archived = [(recorded, stored.get(filename) or by_stem.get(os.path.splitext(filename)[0], filename),
+                            media_id, preset) for recorded, filename, media_id, preset in result.archived]
+        result.files = list(stored.values())
+        for entry in result.entries:
+            entry.files = [stored[f] for f in entry.files if f in stored]
+    
+    def _run_ydl(self, ydl: "YoutubeDL", url: str, platform: Platform, content_type: ContentType,
+                 result: DownloadResult):
+        """Run yt-dlp for a URL, reusing cached extraction results when possible."""
+        if not self.info_cache or content_type != ContentType.VIDEO:
+            ydl.download([url])
+            return
+        
+        key = InfoCache.canonical_key(platform.info.name, url, platform.extract_media_id(url))
+        info = self.info_cache.get(platform.info.name, key)
+        if info is not None:
+            self.logger.debug(f"Using cached extraction for {key}")
+            try:
+                ydl.process_ie_result(info, download=True)
+            except _yt_dlp().utils.DownloadError as e:
+                self.logger.debug(f"Cached extraction for {key} failed: {e}")
+            if result.files:
+                return
+            # Stale format URLs, extract again from scratch
+            self.info_cache.invalidate(key)
+        
+        info = ydl.extract_info(url, download=False, process=False)
+        if not info:
+            return
+        info = ydl.sanitize_info(info)
+        if info.get('_type', 'video') == 'video':
+            self.info_cache.put(platform.info.name, key, info)
+        ydl.process_ie_result(info, download=True)
+    
+    def _show_download_error(self, message: str):
+        """Show a helpful message for a failed download."""
+        reason = classify(message).reason
+        if reason in self.ERROR_HELP:
+            self.ui_manager.show_error(self.ERROR_HELP[reason])
+        else:
+            self.ui_manager.show_error(f"Download failed: {message}")
+            if hasattr(self.ui_manager, 'show_info'):
+                self.ui_manager.show_info("💡 For SSL/certificate errors, try: pip install --upgrade yt-dlp")
     
     def run_interactive(self):
         """Run the downloader in interactive mode with enhanced UI."""
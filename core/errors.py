@@ -0,0 +1,98 @@
+"""Classification of download failures and the retry policy for each class."""
+
+import random
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+class ErrorClass(Enum):
+    """How a failure should be handled."""
+    TRANSIENT = "transient"
+    THROTTLED = "throttled"
+    FORMAT_UNAVAILABLE = "format_unavailable"
+    PERMANENT = "permanent"
+
+@dataclass(frozen=True)
+class Diagnosis:
+    """Outcome of classifying an error message."""
+    error_class: ErrorClass
+    # Finer label, e.g. "private" or "ssl"
+    reason: str
+
+    @property
+    def retryable(self) -> bool:
+        return self.error_class in (ErrorClass.TRANSIENT, ErrorClass.THROTTLED)
+
+# (reason, class, lower-cased substrings) in the order they are checked, first match wins
+RULES = (
+    ("postprocess", ErrorClass.PERMANENT, ("post-processing failed",)),
+    # yt-dlp ran to the end without an error and without a file, it will do the same again
+    ("no_output", ErrorClass.PERMANENT, ("no files were downloaded", "no file was downloaded")),
+    # Retrying cannot help once part of a stream reached its consumer
+    ("stream", ErrorClass.PERMANENT, ("stream interrupted", "cannot be streamed")),
+    ("unsupported", ErrorClass.PERMANENT, ("unsupported url",)),
+    ("throttled", ErrorClass.THROTTLED, ("http error 429", "too many requests", "rate limit", "rate-limit",
+                                         "try again later")),
+    ("ssl", ErrorClass.TRANSIENT, ("ssl", "certificate", "cert_verify", "unable to get local issuer")),
+    ("format_unavailable", ErrorClass.FORMAT_UNAVAILABLE, ("requested format is not available",)),
+    # Instagram and TikTok answer 403 when they throttle
+    ("forbidden", ErrorClass.THROTTLED, ("http error 403",)),
+    ("private", ErrorClass.PERMANENT, ("private video", "this account is private")),
+    ("unavailable", ErrorClass.PERMANENT, ("video unavailable", "has been removed", "http error 404",
+                                           "http error 410")),
+    ("age_restricted", ErrorClass.PERMANENT, ("age-restricted", "confirm your age")),
+    ("copyright", ErrorClass.PERMANENT, ("copyright",)),
+    # Raised by the integrity check, the next attempt usually gets the whole file
+    ("incomplete", ErrorClass.TRANSIENT, ("incomplete download",)),
+    ("network", ErrorClass.TRANSIENT, ("timed out", "connection reset", "connection refused", "connection aborted",
+                                       "remote end closed", "incomplete read", "temporary failure in name resolution",
+                                       "network is unreachable", "http error 5")),
+)
+
+def classify(message: Optional[str]) -> Diagnosis:
+    """Classify an error message; unknown errors count as transient with the reason "other"."""
+    text = (message or "").lower()
+    for reason, error_class, needles in RULES:
+        if any(needle in text for needle in needles):
+            return Diagnosis(error_class, reason)
+    return Diagnosis(ErrorClass.TRANSIENT, "other")
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how patiently to retry one class of failures.
+
+    ``attempts`` counts the first try. Delays grow exponentially from
+    ``base_delay`` up to ``max_delay`` and use full jitter, so jobs that
+    failed together do not retry in lockstep.
+    """
+    attempts: int
+    base_delay: float = 0.0
+    max_delay: float = 0.0
+    multiplier: float = 2.0
+
+    def should_retry(self, attempt: int) -> bool:
+        """Whether to try again after ``attempt`` failed tries."""
+        return attempt < self.attempts
+
+    def delay(self, attempt: int, rng: Callable[[float, float], float] = random.uniform) -> float:
+        """Seconds to wait after the ``attempt``-th failed try."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** max(attempt - 1, 0))
+        return rng(0.0, ceiling) if ceiling > 0 else 0.0
+
+    def sleep_function(self) -> Callable[..., float]:
+        """Return the policy as a yt-dlp ``retry_sleep_functions`` entry."""
+        # yt-dlp passes the number of retries done so far as n
+        return lambda n: self.delay(n + 1)
+
+RETRY_POLICIES: Dict[ErrorClass, RetryPolicy] = {
+    ErrorClass.TRANSIENT: RetryPolicy(attempts=5, base_delay=2.0, max_delay=60.0),
+    ErrorClass.THROTTLED: RetryPolicy(attempts=4, base_delay=30.0, max_delay=600.0),
+    ErrorClass.FORMAT_UNAVAILABLE: RetryPolicy(attempts=1),
+    ErrorClass.PERMANENT: RetryPolicy(attempts=1),
+}
+
+# Reasons retried differently from the rest of their class
+REASON_POLICIES: Dict[str, RetryPolicy] = {
+    # Unrecognised errors get one more chance, not the full budget of known network failures
+    "other": RetryPolicy(attempts=2, base_delay=2.0, max_delay=10.0),
+}
@@ -0,0 +1,147 @@
+"""On-disk cache of yt-dlp extraction results."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Signed media URLs expire, so entries must not outlive them
+DEFAULT_PLATFORM_TTLS = {
+    "YouTube": 4 * 3600,
+    "Vimeo": 2 * 3600,
+    "Twitter/X": 3600,
+    "TikTok": 1800,
+    "Instagram": 1800,
+}
+
+class InfoCache:
+    """Size-bounded LRU cache of raw ``extract_info`` results.
+
+    Each entry is stored as zlib-compressed compact JSON in its own file,
+    named after a hash of the canonical key. File modification times track
+    recency: reads touch the file and eviction removes the least recently
+    used entries once the cache grows past ``max_bytes``.
+    """
+
+    SUFFIX = ".json.z"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024,
+                 default_ttl: float = 3600, platform_ttls: Optional[Dict[str, float]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.platform_ttls = dict(DEFAULT_PLATFORM_TTLS)
+        self.platform_ttls.update(platform_ttls or {})
+        self.logger = logging.getLogger("InfoCache")
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def canonical_key(platform_name: str, url: str, media_id: Optional[str] = None) -> str:
+        """Build a cache key that is stable across equivalent URLs."""
+        if media_id:
+            return f"{platform_name}:{media_id}"
+        parts = urlsplit(url.strip())
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+    def ttl_for(self, platform_name: str) -> float:
+        """Return the time-to-live for a platform's entries."""
+        return self.platform_ttls.get(platform_name, self.default_ttl)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + self.SUFFIX)
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.name.endswith(self.SUFFIX)]
+
+    def get(self, platform_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached info for ``key`` or None when missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            self.logger.warning(f"Discarding unreadable cache entry for {key}: {e}")
+            self.invalidate(key)
+            return None
+
+        if entry.get("key") != key or time.time() - entry.get("stored_at", 0) > self.ttl_for(platform_name):
+            self.invalidate(key)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["info"]
+
+    def put(self, platform_name: str, key: str, info: Dict[str, Any]):
+        """Store extraction results for ``key``."""
+        entry = {"key": key, "platform": platform_name, "stored_at": time.time(), "info": info}
+        try:
+            data = zlib.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        except (TypeError, ValueError) as e:
+            self.logger.debug(f"Not caching {key}: {e}")
+            return
+
+        path = self._path(key)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def invalidate(self, key: str):
+        """Remove an entry from the cache."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.unlink(path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is 90% full."""
+        target = self.max_bytes * 0.9
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                os.unlink(path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+        self.logger.debug(f"Cache evicted down to {self._size} bytes")
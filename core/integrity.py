@@ -0,0 +1,235 @@
+"""Integrity checks of downloaded media: container probes and per-directory manifests."""
+
+import json
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from ..utils.hashing import hash_file
+
+# Extensions of the files a scrub looks at
+MEDIA_EXTENSIONS = {".mp4", ".m4a", ".m4v", ".mov", ".3gp", ".webm", ".mkv", ".mp3", ".aac", ".ogg", ".opus",
+                    ".flac", ".wav"}
+
+# Box types an ISO BMFF file (MP4, M4A, MOV) may start with
+_MP4_FIRST_BOXES = {b"ftyp", b"styp", b"moov", b"free", b"skip", b"wide", b"pdin"}
+
+@dataclass
+class Probe:
+    """What a container probe found out about a file."""
+    ok: bool
+    container: Optional[str] = None
+    duration: Optional[float] = None
+    streams: int = 0
+    error: Optional[str] = None
+
+def _read_box_header(f, offset: int, end: int):
+    """Return (type, header size, box size) of the box at ``offset``, None past the data."""
+    f.seek(offset)
+    header = f.read(16)
+    if len(header) < 8:
+        return None
+    size, box_type = struct.unpack(">I4s", header[:8])
+    header_size = 8
+    if size == 1:
+        if len(header) < 16:
+            return None
+        size = struct.unpack(">Q", header[8:16])[0]
+        header_size = 16
+    elif size == 0:
+        # Extends to the end of the enclosing box
+        size = end - offset
+    return box_type, header_size, size
+
+def probe_mp4(path: str) -> Optional[Probe]:
+    """Check the box structure of an MP4 file without reading the media data.
+
+    Returns None when the file is not ISO BMFF. A box running past the end
+    of the file is the signature of a truncated download.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        moov = None
+        offset = 0
+        while offset < file_size:
+            header = _read_box_header(f, offset, file_size)
+            if header is None:
+                return Probe(False, "mp4", error=f"Truncated box header at byte {offset}")
+            box_type, header_size, size = header
+            if offset == 0 and box_type not in _MP4_FIRST_BOXES:
+                return None
+            if size < header_size:
+                return Probe(False, "mp4", error=f"Corrupt {box_type.decode('latin-1')} box at byte {offset}")
+            if offset + size > file_size:
+                return Probe(False, "mp4", error=f"File ends inside the {box_type.decode('latin-1')} box "
+                                                f"({file_size - offset} of {size} bytes)")
+            if box_type == b"moov":
+                moov = (offset + header_size, offset + size)
+            offset += size
+        if moov is None:
+            return Probe(False, "mp4", error="No moov box, the file cannot be played")
+
+        duration, streams = None, 0
+        offset, end = moov
+        while offset < end:
+            header = _read_box_header(f, offset, end)
+            if header is None or header[2] < header[1]:
+                return Probe(False, "mp4", error="Corrupt moov box")
+            box_type, header_size, size = header
+            if box_type == b"trak":
+                streams += 1
+            elif box_type == b"mvhd":
+                f.seek(offset + header_size)
+                data = f.read(32)
+                if data[:1] == b"\x01":
+                    timescale, length = struct.unpack(">IQ", data[20:32])
+                else:
+                    timescale, length = struct.unpack(">II", data[12:20])
+                # Fragmented files leave the duration at zero or all ones
+                if timescale and length and length not in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+                    duration = length / timescale
+            offset += size
+    if not streams:
+        return Probe(False, "mp4", duration, error="No tracks in the moov box")
+    return Probe(True, "mp4", duration, streams)
+
+class IntegrityChecker:
+    """Verify finished downloads and keep a manifest of them.
+
+    :meth:`check` is cheap enough to run on every finished download: MP4
+    files get their box structure walked, anything else goes through
+    ffprobe when it is installed. Files neither can handle pass unverified.
+
+    :meth:`record` hashes a final file and appends it to the ``MANIFEST``
+    of its directory, one JSON object per line with the latest line per
+    file winning. :meth:`scrub` re-verifies a directory tree against those
+    manifests.
+    """
+
+    MANIFEST = ".manifest.jsonl"
+    # A file whose duration is below this share of the expected one is truncated
+    DURATION_TOLERANCE = 0.9
+
+    def __init__(self, ffprobe_location: Optional[str] = None):
+        self.ffprobe = ffprobe_location or shutil.which("ffprobe")
+        self.logger = logging.getLogger("IntegrityChecker")
+        self._lock = threading.Lock()
+        self._directory_locks: Dict[str, threading.Lock] = {}
+
+    def probe(self, path: str) -> Optional[Probe]:
+        """Probe a media file; None if no prober understands it."""
+        result = probe_mp4(path)
+        if result is None and self.ffprobe:
+            result = self._ffprobe(path)
+        return result
+
+    def _ffprobe(self, path: str) -> Probe:
+        cmd = [self.ffprobe, "-v", "error", "-show_entries", "format=format_name,duration:stream=index",
+               "-of", "json", path]
+        try:
+            completed = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60)
+        except subprocess.TimeoutExpired:
+            return Probe(False, error="ffprobe timed out")
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip().splitlines()
+            return Probe(False, error=message[-1] if message else f"ffprobe exited with {completed.returncode}")
+        data = json.loads(completed.stdout or b"{}")
+        fmt = data.get("format", {})
+        duration = float(fmt["duration"]) if fmt.get("duration") not in (None, "N/A") else None
+        streams = len(data.get("streams", []))
+        if not streams:
+            return Probe(False, fmt.get("format_name"), duration, error="No audio or video streams")
+        return Probe(True, fmt.get("format_name"), duration, streams)
+
+    def check(self, path: str, expected_duration: Optional[float] = None) -> Optional[str]:
+        """Return why a finished file is broken or incomplete, None if it looks fine."""
+        probe = self.probe(path)
+        if probe is None:
+            return None
+        if not probe.ok:
+            return probe.error
+        if expected_duration and probe.duration is not None and \
+                probe.duration < expected_duration * self.DURATION_TOLERANCE - 1:
+            return f"Plays {probe.duration:.1f}s of {expected_duration:.1f}s"
+        return None
+
+    def record(self, path: str, throttle: Optional[Callable[[int], Any]] = None) -> Dict[str, Any]:
+        """Hash and probe a final file and add it to its directory's manifest."""
+        probe = self.probe(path)
+        entry = {
+            "name": os.path.basename(path),
+            "size": os.path.getsize(path),
+            "sha256": hash_file(path, throttle=throttle),
+            "container": probe.container if probe else None,
+            "duration": probe.duration if probe else None,
+            "streams": probe.streams if probe else None,
+            "verified": probe.ok if probe else None,
+            "time": time.time(),
+        }
+        if probe and not probe.ok:
+            entry["error"] = probe.error
+        directory = os.path.dirname(os.path.abspath(path))
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._directory_lock(directory):
+            with open(os.path.join(directory, self.MANIFEST), "a", encoding="utf-8") as f:
+                f.write(line)
+        return entry
+
+    def _directory_lock(self, directory: str) -> threading.Lock:
+        with self._lock:
+            return self._directory_locks.setdefault(directory, threading.Lock())
+
+    def read_manifest(self, directory: str) -> Dict[str, Dict[str, Any]]:
+        """Return the latest manifest entry of every file in a directory."""
+        entries = {}
+        try:
+            with open(os.path.join(directory, self.MANIFEST), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted write
+                        continue
+                    entries[entry["name"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def scrub(self, root: str, throttle: Optional[Callable[[int], Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Re-verify every media file under ``root``.
+
+        Yields one report per file with a ``status`` of ``ok``, ``added``
+        (not in the manifest yet, now recorded), ``changed`` (content
+        differs from the manifest), ``broken`` (fails the probe) or
+        ``missing`` (in the manifest but gone). ``throttle`` bounds the
+        read rate, see :func:`~media_downloader.utils.hashing.hash_file`.
+        """
+        for directory, _, names in os.walk(root):
+            manifest = self.read_manifest(directory)
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() not in MEDIA_EXTENSIONS:
+                    continue
+                path = os.path.join(directory, name)
+                known = manifest.pop(name, None)
+                if known is None:
+                    entry = self.record(path, throttle)
+                    status = "broken" if entry["verified"] is False else "added"
+                    yield {"path": path, "status": status, "error": entry.get("error")}
+                    continue
+
+                probe = self.probe(path)
+                if probe is not None and not probe.ok:
+                    yield {"path": path, "status": "broken", "error": probe.error}
+                    continue
+                if os.path.getsize(path) != known.get("size") or hash_file(path, throttle=throttle) != known.get("sha256"):
+                    yield {"path": path, "status": "changed", "error": "Content differs from the manifest"}
+                else:
+                    yield {"path": path, "status": "ok", "error": None}
+            for name in manifest:
+                yield {"path": os.path.join(directory, name), "status": "missing", "error": None}
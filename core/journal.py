@@ -0,0 +1,163 @@
+"""Crash-safe journal of batch download jobs."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..models import JobState
+from .errors import classify
+
+@dataclass
+class JobRecord:
+    """Last known state of a journaled job."""
+    url: str
+    state: JobState
+    attempts: int = 0
+    error: Optional[str] = None
+
+    def to_line(self) -> str:
+        entry = {"u": self.url, "s": self.state.value, "a": self.attempts}
+        if self.error:
+            entry["e"] = self.error
+        return json.dumps(entry, separators=(",", ":")) + "\n"
+
+class JobJournal:
+    """Append-only journal of job state transitions.
+
+    Every transition is appended as one JSON line and flushed, so the
+    journal survives the process being killed. Replaying it on start-up
+    restores the latest state of every job. The file is compacted to one
+    line per job once enough transitions have accumulated.
+    """
+
+    def __init__(self, path: str, compact_every: int = 10000):
+        self.path = path
+        self.compact_every = compact_every
+        self.logger = logging.getLogger("JobJournal")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, JobRecord] = {}
+        self._appended = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._replay()
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            # Terminate a torn final line so the next record starts cleanly
+            self._file.write("\n")
+            self._file.flush()
+
+    def _replay(self):
+        """Rebuild job states from an existing journal file."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                    record = JobRecord(entry["u"], JobState(entry["s"]), entry.get("a", 0), entry.get("e"))
+                except (ValueError, KeyError):
+                    # A torn final line is expected after a crash
+                    self.logger.warning(f"Ignoring malformed journal line {line_number}")
+                    continue
+                self._jobs[record.url] = record
+                self._appended += 1
+        self.logger.info(f"Replayed journal with {len(self._jobs)} job(s), {len(self.unfinished())} unfinished")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def get(self, url: str) -> Optional[JobRecord]:
+        """Return the last recorded state of a job."""
+        with self._lock:
+            return self._jobs.get(url)
+
+    def is_done(self, url: str) -> bool:
+        """Check whether a job already completed successfully."""
+        record = self.get(url)
+        return record is not None and record.state == JobState.DONE
+
+    def failed_permanently(self, url: str) -> bool:
+        """Check whether a job failed with an error that retrying cannot fix."""
+        record = self.get(url)
+        return record is not None and record.state == JobState.FAILED and not classify(record.error).retryable
+
+    def unfinished(self, failed: bool = False) -> List[str]:
+        """Return URLs of jobs that were queued or running, in journal order.
+
+        With ``failed``, jobs that failed permanently are included too.
+        """
+        with self._lock:
+            records = list(self._jobs.values())
+        return [record.url for record in records
+                if record.state in (JobState.QUEUED, JobState.RUNNING)
+                or (failed and record.state == JobState.FAILED and not classify(record.error).retryable)]
+
+    def queued(self, url: str):
+        """Record that a job was accepted into the batch."""
+        with self._lock:
+            record = self._jobs.get(url)
+            if record is None:
+                record = self._jobs[url] = JobRecord(url, JobState.QUEUED)
+            else:
+                record.state = JobState.QUEUED
+            self._append(record)
+
+    def started(self, url: str):
+        """Record that a job started running."""
+        with self._lock:
+            record = self._jobs.setdefault(url, JobRecord(url, JobState.QUEUED))
+            record.state = JobState.RUNNING
+            record.attempts += 1
+            self._append(record)
+
+    def finished(self, url: str, ok: bool, error: Optional[str] = None):
+        """Record the outcome of a job."""
+        with self._lock:
+            record = self._jobs.setdefault(url, JobRecord(url, JobState.QUEUED))
+            record.state = JobState.DONE if ok else JobState.FAILED
+            record.error = None if ok else error
+            self._append(record)
+
+    def _append(self, record: JobRecord):
+        self._file.write(record.to_line())
+        self._file.flush()
+        self._appended += 1
+        if self._appended >= self.compact_every and self._appended > 2 * len(self._jobs):
+            self._compact()
+
+    def compact(self):
+        """Rewrite the journal with one line per job."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in self._jobs.values():
+                f.write(record.to_line())
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.logger.debug(f"Compacted journal from {self._appended} to {len(self._jobs)} line(s)")
+        self._appended = len(self._jobs)
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,265 @@
+"""Download metrics exported in the OpenMetrics text format."""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..models import DownloadResult, DownloadStatus
+from .errors import ErrorClass, classify
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Upper bounds from 64 KiB/s to 256 MiB/s
+THROUGHPUT_BUCKETS = tuple(float(64 * 1024 * 4 ** i) for i in range(7))
+PHASE_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter family keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} counter", f"# HELP {self.name} {self.documentation}"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}_total{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+class Histogram:
+    """Histogram family with fixed bucket bounds keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last one is +Inf) and sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(labels)
+            return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} histogram", f"# HELP {self.name} {self.documentation}"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    le = _labels(self.labelnames, labels, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total[0])}")
+        return lines
+
+class JobMetrics:
+    """Collect metrics for one download through yt-dlp hooks.
+
+    The download phase starts at the first progress tick, so everything
+    before it counts as extraction. Post-processor hooks time the merge
+    and post-process phases, and deferred post-processing is timed from
+    its hand-off until the future completes.
+    """
+
+    def __init__(self, metrics: "DownloadMetrics", platform: str):
+        self.metrics = metrics
+        self.platform = platform
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._first_tick: Optional[float] = None
+        self._last_finished: Optional[float] = None
+        # filename -> (first tick, bytes reported so far)
+        self._files: Dict[str, Tuple[float, int]] = {}
+        self._pp_started: Dict[str, float] = {}
+
+    def progress_hook(self, d):
+        """yt-dlp progress hook counting bytes and timing the download."""
+        status = d.get('status')
+        if status not in ('downloading', 'finished'):
+            return
+        now = time.monotonic()
+        filename = d.get('filename') or ''
+        downloaded = d.get('downloaded_bytes') or d.get('total_bytes') or 0
+
+        with self._lock:
+            if self._first_tick is None:
+                self._first_tick = now
+                self.metrics.phase_seconds.observe(now - self.started, self.platform, "extraction")
+            first, seen = self._files.get(filename, (now, 0))
+            delta = max(downloaded - seen, 0)
+            self._files[filename] = (first, max(downloaded, seen))
+            if status == 'finished':
+                self._last_finished = now
+
+        if delta:
+            self.metrics.bytes.inc(self.platform, amount=delta)
+        if status == 'finished':
+            elapsed = now - first
+            if downloaded and elapsed > 0:
+                self.metrics.throughput.observe(downloaded / elapsed, self.platform)
+
+    def postprocessor_hook(self, d):
+        """yt-dlp post-processor hook timing merges and other post-processing."""
+        name = d.get('postprocessor') or ''
+        status = d.get('status')
+        if status == 'started':
+            self._pp_started[name] = time.monotonic()
+        elif status == 'finished' and name in self._pp_started:
+            elapsed = time.monotonic() - self._pp_started.pop(name)
+            phase = "merge" if name == "Merger" else "postprocess"
+            self.metrics.phase_seconds.observe(elapsed, self.platform, phase)
+
+    def retry(self, message: str = ""):
+        """Count a retry reported by yt-dlp."""
+        self.metrics.retries.inc(self.platform)
+
+    def finish(self, result: DownloadResult):
+        """Record the outcome of the download."""
+        self.metrics.downloads.inc(self.platform, result.status.value)
+        diagnosis = classify(result.error)
+        # Deferred post-processing failures are counted when their future completes
+        if result.status == DownloadStatus.FAILED and diagnosis.reason != "postprocess":
+            self.metrics.failures.inc(self.platform, diagnosis.error_class.value, diagnosis.reason)
+
+        with self._lock:
+            first, last = self._first_tick, self._last_finished
+        if first is None and result.status != DownloadStatus.SKIPPED:
+            # Nothing was downloaded, the whole run was spent extracting
+            self.metrics.phase_seconds.observe(time.monotonic() - self.started, self.platform, "extraction")
+        elif first is not None and last is not None:
+            self.metrics.phase_seconds.observe(last - first, self.platform, "download")
+
+    def deferred(self, future):
+        """Time post-processing handed off to the post-processing stage."""
+        handed_off = time.monotonic()
+        future.add_done_callback(lambda f: self._deferred_done(f, handed_off))
+
+    def _deferred_done(self, future, handed_off: float):
+        self.metrics.phase_seconds.observe(time.monotonic() - handed_off, self.platform, "postprocess")
+        if future.cancelled() or future.exception() is not None:
+            self.metrics.failures.inc(self.platform, ErrorClass.PERMANENT.value, "postprocess")
+
+class DownloadMetrics:
+    """Per-platform download metrics rendered as OpenMetrics text.
+
+    Create one instance per process, pass it to ``VideoDownloader`` and
+    either write it to a file for a textfile collector with
+    :meth:`write_textfile` or expose it with :meth:`serve`.
+    """
+
+    def __init__(self, namespace: str = "media_downloader"):
+        self.logger = logging.getLogger("DownloadMetrics")
+        self.bytes = Counter(f"{namespace}_downloaded_bytes", "Bytes downloaded.", ["platform"])
+        self.downloads = Counter(f"{namespace}_downloads", "Finished downloads by outcome.",
+                                 ["platform", "status"])
+        self.retries = Counter(f"{namespace}_retries", "Retries reported by yt-dlp.", ["platform"])
+        self.failures = Counter(f"{namespace}_failures", "Failed downloads by error class and reason.",
+                                ["platform", "error_class", "reason"])
+        self.throughput = Histogram(f"{namespace}_throughput_bytes_per_second",
+                                    "Average transfer rate of each downloaded file.",
+                                    ["platform"], THROUGHPUT_BUCKETS)
+        self.phase_seconds = Histogram(f"{namespace}_phase_seconds",
+                                       "Time spent in extraction, download, merge and postprocess.",
+                                       ["platform", "phase"], PHASE_BUCKETS)
+        self._families = [self.bytes, self.downloads, self.retries, self.failures,
+                          self.throughput, self.phase_seconds]
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def job(self, platform: str) -> JobMetrics:
+        """Start collecting metrics for one download."""
+        return JobMetrics(self, platform)
+
+    def render(self) -> str:
+        """Render all metrics in the OpenMetrics text format."""
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """Atomically write the metrics to ``path``."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Expose the metrics on ``http://host:port/metrics`` from a background thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                metrics.logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        self.logger.info(f"Serving metrics on http://{host}:{self._server.server_port}/metrics")
+        return self._server
+
+    def close(self):
+        """Stop the HTTP endpoint if it is running."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
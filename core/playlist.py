@@ -0,0 +1,83 @@
+"""Flat enumeration of playlist and channel entries."""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+
+# Fields yt-dlp adds to playlist entries; output templates may refer to them
+PLAYLIST_FIELDS = {
+    "playlist": lambda info: info.get("title") or info.get("id"),
+    "playlist_id": lambda info: info.get("id"),
+    "playlist_title": lambda info: info.get("title"),
+    "playlist_uploader": lambda info: info.get("uploader"),
+    "playlist_uploader_id": lambda info: info.get("uploader_id"),
+    "playlist_channel": lambda info: info.get("channel"),
+    "playlist_channel_id": lambda info: info.get("channel_id"),
+    "playlist_webpage_url": lambda info: info.get("webpage_url"),
+}
+
+def entry_url(entry: Dict[str, Any]) -> Optional[str]:
+    """Return the URL of a flat entry, without data smuggled in by extractors."""
+    from yt_dlp.utils import unsmuggle_url
+
+    url = entry.get("url") or entry.get("webpage_url")
+    return unsmuggle_url(url)[0] if url else None
+
+def iter_entries(ydl: "YoutubeDL", url: str,
+                 is_collection: Callable[[str], bool] = lambda url: False,
+                 max_depth: int = 2,
+                 skip_rest: Callable[[], bool] = lambda: False) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Lazily yield ``(entry, extra_info)`` for the videos behind a playlist URL.
+
+    ``ydl`` should be configured with ``extract_flat``; entries are pulled
+    page by page as the caller iterates, so stopping early avoids fetching
+    the rest of the list. ``extra_info`` holds the playlist fields
+    (``playlist_index``, ``playlist_title``, ...) that a full extraction
+    would have attached, to be passed on to ``extract_info``.
+
+    Entries that are themselves playlists (channel tabs, for instance) are
+    expanded, as are URL entries for which ``is_collection`` returns True.
+    ``skip_rest`` is asked after every entry; when it returns True the rest
+    of the (sub-)playlist that entry came from is not listed and iteration
+    goes on with the next one, e.g. the next tab of a channel.
+    """
+    info = ydl.extract_info(url, download=False, process=False)
+    # Follow redirects such as a channel page pointing to its videos tab
+    for _ in range(max_depth + 1):
+        if not info or info.get("_type") not in ("url", "url_transparent"):
+            break
+        info = ydl.extract_info(info["url"], download=False, process=False, ie_key=info.get("ie_key"))
+    if not info:
+        return
+    if info.get("_type", "video") == "video":
+        yield info, {}
+        return
+    yield from _iter_playlist(ydl, info, is_collection, max_depth, skip_rest)
+
+def _iter_playlist(ydl: "YoutubeDL", info: Dict[str, Any], is_collection: Callable[[str], bool],
+                   max_depth: int, skip_rest: Callable[[], bool]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    from yt_dlp.utils import PlaylistEntries
+
+    playlist_count = info.get("playlist_count")
+    if playlist_count is None and isinstance(info.get("entries"), list):
+        playlist_count = len(info["entries"])
+    extra = {name: field(info) for name, field in PLAYLIST_FIELDS.items()}
+    extra["playlist_count"] = playlist_count
+    extra["n_entries"] = playlist_count
+    # yt-dlp pads %(playlist_index)s to the width of the last index
+    extra["__last_playlist_index"] = playlist_count or 0
+
+    for autonumber, (index, entry) in enumerate(PlaylistEntries(ydl, info).get_requested_items(), 1):
+        if not entry:
+            continue
+        if max_depth > 0 and entry.get("_type") == "playlist":
+            yield from _iter_playlist(ydl, entry, is_collection, max_depth - 1, skip_rest)
+            continue
+        if (max_depth > 0 and entry.get("_type") in ("url", "url_transparent")
+                and is_collection(entry_url(entry) or "")):
+            yield from iter_entries(ydl, entry_url(entry), is_collection, max_depth - 1, skip_rest)
+            continue
+        yield entry, dict(extra, playlist_index=index, playlist_autonumber=autonumber)
+        if skip_rest():
+            return
@@ -0,0 +1,105 @@
+"""Post-processing stage running separately from downloads."""
+
+import contextlib
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+
+class PostProcessingStage:
+    """Run ffmpeg post-processing on a pool sized to the CPU count.
+
+    Post-processors listed in ``DEFERRABLE`` are removed from the yt-dlp
+    run and applied here instead, so a download worker hands its finished
+    file over and moves straight on to the next fetch. Files are handed
+    over from yt-dlp's ``post_hooks``, after its own fixups are done with
+    them, and go through the same yt-dlp post-processor classes. Each
+    ffmpeg invocation is its own process; the pool only bounds how many
+    run at once.
+    """
+
+    DEFERRABLE = {"FFmpegExtractAudio"}
+
+    def __init__(self, max_workers: Optional[int] = None, ffmpeg_location: Optional[str] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.ffmpeg = ffmpeg_location or shutil.which("ffmpeg")
+        self.logger = logging.getLogger("PostProcessingStage")
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="postprocess")
+        self._ydl: Optional["YoutubeDL"] = None
+        self._ydl_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether ffmpeg was found, without it nothing can be deferred."""
+        return self.ffmpeg is not None
+
+    def split(self, ydl_opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Remove deferrable post-processors from ``ydl_opts`` and return them."""
+        if not self.available or "+" in str(ydl_opts.get("format", "")):
+            # Merged formats report intermediate files, keep everything in yt-dlp
+            return []
+
+        kept, deferred = [], []
+        for pp in ydl_opts.get("postprocessors", []):
+            (deferred if pp.get("key") in self.DEFERRABLE else kept).append(pp)
+        ydl_opts["postprocessors"] = kept
+        return deferred
+
+    def submit(self, filename: str, postprocessors: List[Dict[str, Any]]) -> "Future[str]":
+        """Queue post-processing of a finished file; the future yields the final filename."""
+        return self._executor.submit(self._process, filename, postprocessors)
+
+    def run(self, fn: Callable[..., Any], *args) -> Future:
+        """Run other work on finished files, such as moving or hashing them, on the stage's pool."""
+        return self._executor.submit(fn, *args)
+
+    @property
+    def ydl(self) -> "YoutubeDL":
+        """YoutubeDL the post-processors read their options from and log through."""
+        with self._ydl_lock:
+            if self._ydl is None:
+                from yt_dlp import YoutubeDL
+                self._ydl = YoutubeDL({"quiet": True, "no_warnings": True, "ffmpeg_location": self.ffmpeg,
+                                       "logger": logging.getLogger("yt_dlp")})
+            return self._ydl
+
+    def _process(self, filename: str, postprocessors: List[Dict[str, Any]]) -> str:
+        from yt_dlp.postprocessor import get_postprocessor
+
+        info = {"filepath": filename, "ext": os.path.splitext(filename)[1].lstrip(".")}
+        for options in postprocessors:
+            arguments = {name: value for name, value in options.items() if name not in ("key", "when")}
+            pp = get_postprocessor(options["key"])(self.ydl, **arguments)
+            files_to_delete, info = pp.run(info)
+            # yt-dlp deletes the sources once its post-processors are done, unless asked to keep them
+            for path in files_to_delete:
+                if path != info["filepath"]:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(path)
+        self.logger.info(f"Post-processed: {os.path.basename(info['filepath'])}")
+        return info["filepath"]
+
+    def wait(self, pending: List[Tuple[str, "Future[str]"]]) -> Tuple[Dict[str, str], List[str]]:
+        """Wait for queued jobs and map source files to their final names.
+
+        Returns the mapping along with error messages of jobs that failed.
+        """
+        renamed, errors = {}, []
+        for source, future in pending:
+            try:
+                renamed[source] = future.result()
+            except Exception as e:
+                self.logger.error(f"Post-processing failed for {source}: {e}")
+                errors.append(str(e))
+        return renamed, errors
+
+    def close(self, wait: bool = True, cancel_pending: bool = False):
+        """Shut down the worker pool, dropping jobs that did not start yet with ``cancel_pending``."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+        if self._ydl is not None:
+            self._ydl.close()
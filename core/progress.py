@@ -1,24 +1,62 @@
 """Progress handling for downloads."""
 
 import os
-from typing import TYPE_CHECKING
+import threading
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Dict, Optional
 
 if TYPE_CHECKING:
     from ..ui.base import UIManager
 
 # Try to import Rich components
 try:
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+    from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn,
+                               DownloadColumn, TransferSpeedColumn)
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
 
+class _FileState:
+    """Latest progress reported for one file."""
+    __slots__ = ("key", "name", "downloaded", "total", "finished", "task_id", "dirty", "shown_finished")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.name = os.path.basename(key)
+        self.downloaded = 0
+        self.total = None
+        self.finished = False
+        self.task_id = None
+        self.dirty = True
+        self.shown_finished = False
+
 class ProgressHandler:
-    def __init__(self, ui_manager: "UIManager"):
+    """yt-dlp progress hook rendering one bar per file plus a batch total.
+
+    The hook itself only records the latest numbers for a file, so it is
+    cheap and safe to share between concurrent downloads. A background
+    thread coalesces those updates and redraws at ``refresh_per_second``,
+    keeping rendering work off the download threads.
+    """
+
+    def __init__(self, ui_manager: "UIManager", refresh_per_second: float = 4.0, keep_finished: int = 5):
         self.ui_manager = ui_manager
         self.progress = None
-        self.task_id = None
-        
+        self.refresh_interval = 1.0 / refresh_per_second
+        self.keep_finished = keep_finished
+
+        self._lock = threading.Lock()
+        self._files: Dict[str, _FileState] = OrderedDict()
+        self._finished_order = deque()
+        self._items_done = 0
+        # Files whose bars were already removed
+        self._retired_count = 0
+        self._retired_downloaded = 0
+        self._retired_total = 0
+        self._total_task = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
         # Check if we have Rich and a Rich UI manager
         if RICH_AVAILABLE and hasattr(ui_manager, 'console'):
             self.progress = Progress(
@@ -26,33 +64,87 @@ class ProgressHandler:
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                DownloadColumn(),
+                TransferSpeedColumn(),
                 TimeRemainingColumn(),
-                console=ui_manager.console
+                console=ui_manager.console,
+                auto_refresh=False
             )
-    
+
     def __call__(self, d):
-        if d['status'] == 'downloading' and self.progress:
-            filename = os.path.basename(d.get('filename', 'Unknown'))
-            
-            if self.task_id is not None:
-                self.progress.update(
-                    self.task_id,
-                    description=f"Downloading: {filename}",
-                    completed=d.get('downloaded_bytes', 0),
-                    total=d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-                )
-            else:
-                total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-                self.task_id = self.progress.add_task(
-                    f"Downloading: {filename}",
-                    total=total
-                )
-    
+        if not self.progress or d['status'] not in ('downloading', 'finished'):
+            return
+
+        filename = d.get('filename') or 'Unknown'
+        with self._lock:
+            state = self._files.get(filename)
+            if state is None:
+                state = self._files[filename] = _FileState(filename)
+            state.downloaded = d.get('downloaded_bytes') or state.downloaded
+            state.total = d.get('total_bytes') or d.get('total_bytes_estimate') or state.total
+            if d['status'] == 'finished' and not state.finished:
+                state.finished = True
+                state.total = state.total or state.downloaded
+                self._items_done += 1
+            state.dirty = True
+
+    def _render(self):
+        """Apply pending updates to the Rich display."""
+        with self._lock:
+            changed = [state for state in self._files.values() if state.dirty]
+            for state in changed:
+                state.dirty = False
+            snapshot = [(s, s.downloaded, s.total, s.finished) for s in changed]
+            downloaded = self._retired_downloaded + sum(s.downloaded for s in self._files.values())
+            total = self._retired_total + sum(s.total or s.downloaded for s in self._files.values())
+            seen = self._retired_count + len(self._files)
+            done = self._items_done
+
+        for state, completed, size, finished in snapshot:
+            if state.task_id is None:
+                state.task_id = self.progress.add_task(f"Downloading: {state.name}", total=size)
+            description = f"{'Downloaded' if finished else 'Downloading'}: {state.name}"
+            self.progress.update(state.task_id, description=description, completed=completed, total=size)
+            if finished and not state.shown_finished:
+                state.shown_finished = True
+                self._finished_order.append(state)
+
+        # Only the most recently finished bars stay on screen
+        while len(self._finished_order) > self.keep_finished:
+            old = self._finished_order.popleft()
+            self.progress.remove_task(old.task_id)
+            with self._lock:
+                self._files.pop(old.key, None)
+                self._retired_count += 1
+                self._retired_downloaded += old.downloaded
+                self._retired_total += old.total or old.downloaded
+
+        if seen > 1:
+            description = f"[bold]Total: {done}/{seen} files"
+            if self._total_task is None:
+                self._total_task = self.progress.add_task(description, total=total)
+            self.progress.update(self._total_task, description=description, completed=downloaded, total=total)
+
+        self.progress.refresh()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self._render()
+
     def __enter__(self):
         if self.progress:
-            return self.progress.__enter__()
+            self.progress.__enter__()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="progress-render", daemon=True)
+            self._thread.start()
+            return self.progress
         return self
-    
+
     def __exit__(self, *args):
         if self.progress:
+            self._stop.set()
+            if self._thread:
+                self._thread.join()
+                self._thread = None
+            self._render()
             return self.progress.__exit__(*args)
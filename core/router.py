@@ -0,0 +1,78 @@
+"""Host-indexed URL routing to platform handlers."""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from ..models import ContentType
+from .base import Platform
+
+@dataclass
+class Classification:
+    """Platform and content type detected for a URL."""
+    url: str
+    platform: Optional[Platform]
+    content_type: Optional[ContentType]
+
+class PlatformRouter:
+    """Route URLs to platforms through a host -> platform hash index.
+    
+    Hosts are normalised and patterns compiled when a platform is
+    registered, so routing a URL costs one ``urlsplit``, one dictionary
+    lookup and the pattern checks of the platforms serving that host.
+    """
+    
+    def __init__(self, platforms: Iterable[Platform] = ()):
+        self.platforms: List[Platform] = []
+        self._by_host: Dict[str, List[Platform]] = {}
+        self._custom: List[Platform] = []
+        self.logger = logging.getLogger("PlatformRouter")
+        for platform in platforms:
+            self.register(platform)
+    
+    def register(self, platform: Platform):
+        """Add a platform to the routing table."""
+        if platform in self.platforms:
+            return
+        self.platforms.append(platform)
+        if type(platform).validate_url is not Platform.validate_url:
+            # Custom validation logic can't be indexed, check it last
+            self._custom.append(platform)
+            return
+        for host in platform.info.host_set:
+            self._by_host.setdefault(host, []).append(platform)
+    
+    def route(self, url: str) -> Optional[Platform]:
+        """Return the platform handling ``url``, or None."""
+        try:
+            parsed = urlsplit(url)
+        except ValueError:
+            return None
+        if parsed.scheme not in {"http", "https"}:
+            return None
+        
+        for platform in self._by_host.get(parsed.netloc.lower(), ()):
+            if platform.info.matches_pattern(url):
+                return platform
+        
+        for platform in self._custom:
+            if platform.validate_url(url):
+                return platform
+        
+        return None
+    
+    def classify(self, url: str) -> Classification:
+        """Detect the platform and content type of a URL."""
+        platform = self.route(url)
+        content_type = platform.classify_content(url) if platform else None
+        return Classification(url, platform, content_type)
+    
+    def classify_many(self, urls: Iterable[str]) -> Iterator[Classification]:
+        """Classify URLs in bulk, lazily and in input order."""
+        for url in urls:
+            try:
+                yield self.classify(url)
+            except Exception as e:
+                self.logger.error(f"Error classifying {url}: {e}")
+                yield Classification(url, None, None)
\ No newline at end of file
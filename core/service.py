@@ -0,0 +1,271 @@
+"""Long-running download service with job tracking."""
+
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..models import DownloadConfig, DownloadResult, DownloadStatus, JobState
+from .downloader import VideoDownloader
+
+@dataclass
+class Job:
+    """A download submitted to the service."""
+    id: str
+    url: str
+    config: DownloadConfig
+    state: JobState = JobState.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = 0
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[DownloadResult] = None
+    cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+    progress_sent: float = field(default=0.0, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "url": self.url,
+            "state": self.state.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "attempts": self.attempts,
+            "progress": dict(self.progress),
+        }
+        if self.result is not None:
+            data["result"] = {
+                "status": self.result.status.value,
+                "platform": self.result.platform,
+                "files": list(self.result.files),
+                "error": self.result.error,
+                "elapsed": self.result.elapsed,
+            }
+        return data
+
+class DownloadService:
+    """Run downloads submitted at any time on one warm downloader.
+
+    The wrapped :class:`VideoDownloader` and everything it holds (platform
+    handlers, archive, metadata cache, yt-dlp itself) stay loaded between
+    jobs, so a job only pays for its own download. Jobs run on a bounded
+    worker pool and are retried according to the downloader's retry
+    policies. Finished jobs are kept, up to ``max_finished``, for status
+    queries.
+
+    Subscribers receive every state change and progress update as a dict;
+    a subscriber that falls behind loses progress updates, never state
+    changes. :meth:`drain` stops accepting jobs and waits for the
+    submitted ones, which is what a SIGTERM should trigger.
+    """
+
+    # Minimum seconds between two progress events of a job
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, downloader: VideoDownloader, max_workers: int = 4, max_finished: int = 1000,
+                 max_queued_events: int = 1024):
+        self.downloader = downloader
+        self.max_finished = max_finished
+        self.max_queued_events = max_queued_events
+        self.logger = logging.getLogger("DownloadService")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="service")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._subscribers: List["queue.Queue"] = []
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._sequence = itertools.count(1)
+
+    @property
+    def accepting(self) -> bool:
+        return self._accepting
+
+    def submit(self, url: str, config: DownloadConfig) -> Job:
+        """Queue a download and return its job."""
+        job = Job(uuid.uuid4().hex[:12], url.strip(), config)
+        with self._lock:
+            if not self._accepting:
+                raise RuntimeError("The service is shutting down")
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        self._publish(job, "state")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, state: Optional[JobState] = None) -> List[Job]:
+        """Return the known jobs in submission order, optionally filtered by state."""
+        with self._lock:
+            return [job for job in self._jobs.values() if state is None or job.state == state]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job. Returns None for unknown jobs."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancelled.set()
+        if job.future is not None and job.future.cancel():
+            # Never started
+            self._finish(job, DownloadResult(job.url, DownloadStatus.CANCELLED, error="Download cancelled"))
+        return job
+
+    def _run(self, job: Job):
+        job.state = JobState.RUNNING
+        job.started_at = time.time()
+        self._publish(job, "state")
+        try:
+            result = self._download(job)
+        except Exception as e:
+            self.logger.error(f"Job {job.id} crashed: {e}")
+            result = DownloadResult(job.url, DownloadStatus.FAILED, error=str(e))
+        self._finish(job, result)
+
+    def _download(self, job: Job) -> DownloadResult:
+        hook = lambda d: self._on_progress(job, d)
+        while True:
+            job.attempts += 1
+            result = self.downloader._download_one(job.url, job.config, False, hooks=[hook],
+                                                   cancelled=job.cancelled)
+            delay = self.downloader.retry_delay(result, job.attempts)
+            if delay is None:
+                return result
+            self.logger.info(f"Retrying job {job.id} in {delay:.1f}s after: {result.error}")
+            # Waking up early means the job was cancelled
+            if job.cancelled.wait(delay):
+                return DownloadResult(job.url, DownloadStatus.CANCELLED, error="Download cancelled")
+
+    def _on_progress(self, job: Job, d):
+        if d['status'] != 'downloading':
+            return
+        job.progress = {
+            "filename": os.path.basename(d.get('filename') or ''),
+            "downloaded_bytes": d.get('downloaded_bytes') or 0,
+            "total_bytes": d.get('total_bytes') or d.get('total_bytes_estimate'),
+            "speed": d.get('speed'),
+            "eta": d.get('eta'),
+        }
+        now = time.monotonic()
+        if now - job.progress_sent >= self.PROGRESS_INTERVAL:
+            job.progress_sent = now
+            self._publish(job, "progress")
+
+    def _finish(self, job: Job, result: DownloadResult):
+        job.result = result
+        job.finished_at = time.time()
+        if result.status == DownloadStatus.CANCELLED:
+            job.state = JobState.CANCELLED
+        else:
+            job.state = JobState.DONE if result.ok else JobState.FAILED
+        self._publish(job, "state")
+        with self._lock:
+            finished = [job_id for job_id, known in self._jobs.items() if known.finished]
+            for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+
+    def subscribe(self, job_id: Optional[str] = None, stop: Optional[threading.Event] = None,
+                  heartbeat: float = 15.0) -> Iterator[Dict[str, Any]]:
+        """Yield events as they happen, for one job or all of them.
+
+        A ``{"type": "heartbeat"}`` event is yielded after ``heartbeat``
+        quiet seconds so callers can notice dead connections. The iterator
+        ends once ``stop`` is set, the job finished or the service drained.
+        """
+        events: "queue.Queue" = queue.Queue(self.max_queued_events)
+        with self._lock:
+            self._subscribers.append(events)
+        try:
+            if job_id is not None:
+                job = self.get(job_id)
+                if job is None:
+                    return
+                yield self._event(job, "state")
+                if job.finished:
+                    return
+            while not (stop is not None and stop.is_set()):
+                try:
+                    event = events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield {"type": "heartbeat", "time": time.time()}
+                    continue
+                if event is None:
+                    return
+                if job_id is not None and event["job"]["id"] != job_id:
+                    continue
+                yield event
+                if job_id is not None and event["type"] == "state" and event["job"]["state"] in (
+                        JobState.DONE.value, JobState.FAILED.value, JobState.CANCELLED.value):
+                    return
+        finally:
+            with self._lock:
+                self._subscribers.remove(events)
+
+    def _event(self, job: Job, kind: str) -> Dict[str, Any]:
+        return {"type": kind, "seq": next(self._sequence), "time": time.time(), "job": job.to_dict()}
+
+    def _publish(self, job: Job, kind: str):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        event = self._event(job, kind)
+        for events in subscribers:
+            # State changes must arrive, progress updates may be dropped
+            self._offer(events, event, force=kind == "state")
+
+    @staticmethod
+    def _offer(events: "queue.Queue", event: Optional[Dict[str, Any]], force: bool):
+        try:
+            events.put_nowait(event)
+        except queue.Full:
+            if force:
+                # Make room by dropping the oldest event
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    pass
+                events.put_nowait(event)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting jobs and wait for submitted ones. Returns False on timeout."""
+        with self._lock:
+            self._accepting = False
+            pending = [job for job in self._jobs.values() if not job.finished]
+        self.logger.info(f"Draining {len(pending)} job(s)")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                job.future.result(timeout=remaining)
+            except Exception:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+        return True
+
+    def close(self, cancel: bool = False):
+        """Shut down the worker pool, cancelling unfinished jobs if asked."""
+        with self._lock:
+            self._accepting = False
+            jobs = list(self._jobs.values())
+        if cancel:
+            for job in jobs:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for events in subscribers:
+            self._offer(events, None, force=True)
@@ -0,0 +1,77 @@
+"""Destinations for media streamed straight from the network instead of a file."""
+
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+
+# Read size of streamed downloads, small enough that consumers get data promptly
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Only plain HTTP(S) formats arrive as one stream; DASH and HLS come in fragments
+_STREAMABLE = "[protocol^=http][protocol!*=dash]"
+
+def streamable_format(format_spec: str) -> str:
+    """Restrict a yt-dlp format selector to single files served over plain HTTP(S).
+
+    Alternatives that merge several formats are dropped, since merging
+    needs ffmpeg and files on disk.
+    """
+    choices = [choice.strip() for choice in format_spec.split("/")]
+    choices = [choice for choice in choices if choice and "+" not in choice and "," not in choice]
+    choices.append("best")
+    return "/".join(f"{choice}{_STREAMABLE}" for choice in dict.fromkeys(choices))
+
+class MediaWriter(ABC):
+    """Receives the bytes of one streamed file."""
+
+    @abstractmethod
+    def write(self, chunk: bytes):
+        pass
+
+    def close(self) -> Optional[str]:
+        """Finish the file and return where it ended up, None if it has no location."""
+        return None
+
+    def abort(self):
+        """Give up on the file after a failed download."""
+
+class MediaSink(ABC):
+    """Destination of streamed downloads.
+
+    :meth:`open` is called for every file with its name relative to the
+    output directory and returns the :class:`MediaWriter` receiving the
+    file's bytes as they arrive. Sinks that set ``stores_files`` also take
+    finished files from disk, for media that cannot be streamed.
+    """
+
+    stores_files = False
+
+    @abstractmethod
+    def open(self, name: str, info: Dict[str, Any]) -> MediaWriter:
+        pass
+
+class StreamSink(MediaSink, MediaWriter):
+    """Write media to a binary stream, stdout by default, or pass each chunk to a callback.
+
+    Every file goes to the same stream, so only one download may use the
+    sink at a time.
+    """
+
+    def __init__(self, target: Union[BinaryIO, Callable[[bytes], Any], None] = None):
+        if target is None:
+            target = sys.stdout.buffer
+        self._write = target.write if hasattr(target, "write") else target
+        self._flush = getattr(target, "flush", None)
+        self.bytes_written = 0
+
+    def open(self, name: str, info: Dict[str, Any]) -> MediaWriter:
+        return self
+
+    def write(self, chunk: bytes):
+        self._write(chunk)
+        self.bytes_written += len(chunk)
+
+    def close(self) -> Optional[str]:
+        if self._flush is not None:
+            self._flush()
+        return None
@@ -0,0 +1,214 @@
+"""Storage sinks: where finished media ends up, on local disk or in object storage."""
+
+import contextlib
+import importlib.util
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from ..utils.hashing import iter_chunks
+from .sinks import MediaSink, MediaWriter
+
+# S3 rejects multipart parts below 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class StorageSink(MediaSink):
+    """A sink that keeps files, taking them streamed or finished on disk.
+
+    Media that can be streamed is written through :meth:`open` while it
+    downloads. Anything else (merged formats, HLS, playlists) is downloaded
+    to disk first and handed over with :meth:`store`. Subclasses implement
+    :meth:`open`; :meth:`store` writes through it unless overridden.
+    """
+
+    stores_files = True
+
+    def store(self, path: str, name: str) -> str:
+        """Move a finished file into storage under ``name`` and return its location.
+
+        The local file is removed once it is stored.
+        """
+        writer = self.open(name, {})
+        try:
+            for chunk in iter_chunks(path):
+                writer.write(bytes(chunk))
+            location = writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        os.unlink(path)
+        return location
+
+    def close(self):
+        """Release the sink's resources."""
+
+class _LocalWriter(MediaWriter):
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(self.tmp_path, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+
+    def close(self) -> Optional[str]:
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.tmp_path)
+
+class LocalFileSink(StorageSink):
+    """Store files under a local directory; streamed files appear only once complete."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def open(self, name: str, info: Dict[str, Any]) -> MediaWriter:
+        return _LocalWriter(self.path_for(name))
+
+    def store(self, path: str, name: str) -> str:
+        target = self.path_for(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # A rename on the same filesystem, a copy otherwise
+        shutil.move(path, target)
+        return target
+
+class _S3Upload(MediaWriter):
+    """One object being uploaded, in parts once it outgrows a single part."""
+
+    def __init__(self, sink: "S3Sink", key: str):
+        self.sink = sink
+        self.key = key
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Future] = []
+        content_type = mimetypes.guess_type(key)[0]
+        self._extra = {"ContentType": content_type} if content_type else {}
+
+    def write(self, chunk: bytes):
+        self._buffer += chunk
+        if len(self._buffer) >= self.sink.part_size:
+            self._send_part()
+
+    def _send_part(self):
+        for part in self._parts:
+            if part.done() and part.exception() is not None:
+                raise part.exception()
+        client = self.sink.client
+        if self._upload_id is None:
+            self._upload_id = client.create_multipart_upload(Bucket=self.sink.bucket, Key=self.key,
+                                                             **self._extra)["UploadId"]
+        body, self._buffer = bytes(self._buffer), bytearray()
+        # Blocks the download while max_pending parts are in flight, bounding the memory used
+        self.sink._slots.acquire()
+        future = self.sink._executor.submit(self._upload_part, len(self._parts) + 1, body)
+        future.add_done_callback(lambda _: self.sink._slots.release())
+        self._parts.append(future)
+
+    def _upload_part(self, number: int, body: bytes) -> Dict[str, Any]:
+        response = self.sink.client.upload_part(Bucket=self.sink.bucket, Key=self.key, UploadId=self._upload_id,
+                                                PartNumber=number, Body=body)
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def close(self) -> Optional[str]:
+        client = self.sink.client
+        if self._upload_id is None:
+            client.put_object(Bucket=self.sink.bucket, Key=self.key, Body=bytes(self._buffer), **self._extra)
+        else:
+            if self._buffer:
+                self._send_part()
+            try:
+                parts = [part.result() for part in self._parts]
+            except BaseException:
+                self.abort()
+                raise
+            client.complete_multipart_upload(Bucket=self.sink.bucket, Key=self.key, UploadId=self._upload_id,
+                                             MultipartUpload={"Parts": parts})
+        return self.sink.url_for(self.key)
+
+    def abort(self):
+        for part in self._parts:
+            part.cancel()
+        for part in self._parts:
+            with contextlib.suppress(BaseException):
+                part.result()
+        if self._upload_id is not None:
+            try:
+                self.sink.client.abort_multipart_upload(Bucket=self.sink.bucket, Key=self.key,
+                                                        UploadId=self._upload_id)
+            except Exception as e:
+                self.sink.logger.warning(f"Could not abort the upload of {self.key}: {e}")
+            self._upload_id = None
+
+class S3Sink(StorageSink):
+    """Upload files to an S3-compatible bucket while they download.
+
+    Files are buffered up to ``part_size`` bytes and sent as multipart
+    upload parts from a pool of ``max_pending`` threads. Once that many
+    parts are in flight, downloads wait, so memory stays bounded at
+    ``max_pending`` parts plus one buffered part per running download.
+    Files smaller than a part are sent with a single PUT.
+
+    ``client`` is any object with boto3's S3 client methods, which makes
+    the sink testable against a local stand-in; without it a boto3 client
+    for ``endpoint_url`` (MinIO, LocalStack, ...) is created on first use.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None, endpoint_url: Optional[str] = None,
+                 part_size: int = 8 * 1024 * 1024, max_pending: int = 4):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        if client is None and importlib.util.find_spec("boto3") is None:
+            raise ImportError("boto3 is required for S3 output. Install with: pip install boto3")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self.part_size = part_size
+        self.logger = logging.getLogger("S3Sink")
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_pending, thread_name_prefix="s3-upload")
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "S3Sink":
+        """Create a sink for an ``s3://bucket/prefix`` URL."""
+        if not url.startswith("s3://"):
+            raise ValueError(f"Invalid S3 URL '{url}', expected s3://BUCKET[/PREFIX]")
+        bucket, _, prefix = url[len("s3://"):].partition("/")
+        if not bucket:
+            raise ValueError(f"Invalid S3 URL '{url}', expected s3://BUCKET[/PREFIX]")
+        return cls(bucket, prefix, **kwargs)
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                import boto3
+                self._client = boto3.client("s3", endpoint_url=self.endpoint_url)
+            return self._client
+
+    def key_for(self, name: str) -> str:
+        key = name.replace(os.sep, "/").lstrip("/")
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def url_for(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def open(self, name: str, info: Dict[str, Any]) -> MediaWriter:
+        return _S3Upload(self, self.key_for(name))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
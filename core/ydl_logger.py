@@ -0,0 +1,44 @@
+"""Logger adapter capturing yt-dlp's messages for a single job."""
+
+import logging
+from typing import Callable, List, Optional
+
+class YDLLogger:
+    """Forward yt-dlp output to ``logging`` and remember what went wrong.
+
+    yt-dlp routes every message through the ``logger`` option when one is
+    set; this adapter counts retry notices and keeps the error messages
+    of the job so callers can inspect them after the run.
+    """
+
+    def __init__(self, on_retry: Optional[Callable[[str], None]] = None):
+        self.on_retry = on_retry
+        self.retries = 0
+        self.errors: List[str] = []
+        self.logger = logging.getLogger("yt_dlp")
+
+    def _check_retry(self, msg: str):
+        if "Retrying" in msg:
+            self.retries += 1
+            if self.on_retry:
+                self.on_retry(msg)
+
+    def debug(self, msg: str):
+        # yt-dlp also sends regular screen output through debug()
+        self._check_retry(msg)
+        self.logger.debug(msg)
+
+    def info(self, msg: str):
+        self.logger.info(msg)
+
+    def warning(self, msg: str):
+        self._check_retry(msg)
+        self.logger.warning(msg)
+
+    def error(self, msg: str):
+        self.errors.append(msg)
+        self.logger.error(msg)
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self.errors[-1] if self.errors else None
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""Pool of warm YoutubeDL instances."""
+
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+
+# Options that change from job to job and are swapped on checkout instead of keying the pool
+JOB_OPTIONS = ("progress_hooks", "postprocessor_hooks", "post_hooks", "logger", "match_filter")
+
+def _option_key(options: Dict[str, Any]) -> str:
+    static = {name: value for name, value in options.items() if name not in JOB_OPTIONS}
+    # Callables such as retry_sleep_functions only match when they are the same object
+    return json.dumps(static, sort_keys=True, default=lambda value: f"{type(value).__name__}@{id(value)}")
+
+class YDLPool:
+    """Reuse ``YoutubeDL`` instances between jobs with the same options.
+
+    Creating an instance loads the extractor classes, builds the HTTP
+    stack and the cookie jar; a reused one also keeps its keep-alive
+    connections. Instances are keyed on their options minus the per-job
+    ones in :data:`JOB_OPTIONS`, which :meth:`checkout` swaps in for the
+    duration of the job. An instance is only used by one job at a time and
+    goes back to the pool only if the job did not raise.
+
+    At most ``max_idle`` instances are kept; the least recently used ones
+    and those idle for longer than ``idle_timeout`` seconds are closed.
+    """
+
+    def __init__(self, max_idle: int = 8, idle_timeout: float = 300.0):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.logger = logging.getLogger("YDLPool")
+        self.created = 0
+        self.reused = 0
+        self._idle: "OrderedDict[Tuple[str, int], Tuple[YoutubeDL, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def checkout(self, options: Dict[str, Any], factory: Optional[Callable[[Dict[str, Any]], "YoutubeDL"]] = None
+                 ) -> Iterator["YoutubeDL"]:
+        """Lend an instance configured with ``options`` for the duration of a job."""
+        key = _option_key(options)
+        ydl = self._take(key)
+        if ydl is None:
+            if factory is None:
+                from yt_dlp import YoutubeDL as factory
+            ydl = factory(options)
+            with self._lock:
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        # Also for new instances: their post-processors got each postprocessor_hook twice
+        self._prepare(ydl, options)
+        try:
+            yield ydl
+        except BaseException:
+            # The instance may be halfway through a download, don't hand it out again
+            self._close(ydl)
+            raise
+        self._release(key, ydl)
+
+    def _take(self, key: str) -> Optional["YoutubeDL"]:
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            for pool_key in self._idle:
+                if pool_key[0] == key:
+                    ydl, _ = self._idle.pop(pool_key)
+                    return ydl
+        return None
+
+    @staticmethod
+    def _prepare(ydl: "YoutubeDL", options: Dict[str, Any]):
+        """Swap in the hooks and job options of the next job."""
+        for name in ("logger", "match_filter"):
+            ydl.params[name] = options.get(name)
+        YDLPool._clear_hooks(ydl)
+        for hook in options.get("progress_hooks", []):
+            ydl.add_progress_hook(hook)
+        for hook in options.get("postprocessor_hooks", []):
+            ydl.add_postprocessor_hook(hook)
+        for hook in options.get("post_hooks", []):
+            ydl.add_post_hook(hook)
+        # Per-run counters; a failed job would otherwise mark the next ones failed too
+        ydl._download_retcode = 0
+        ydl._num_downloads = 0
+        ydl._printed_messages = set()
+
+    @staticmethod
+    def _clear_hooks(ydl: "YoutubeDL"):
+        ydl._progress_hooks = []
+        ydl._postprocessor_hooks = []
+        ydl._post_hooks = []
+        # Post-processors built from the options hold their own copies of the hooks
+        for pps in ydl._pps.values():
+            for pp in pps:
+                pp._progress_hooks = [pp.report_progress]
+
+    def _release(self, key: str, ydl: "YoutubeDL"):
+        # Drop references to the finished job so its objects can be freed
+        self._clear_hooks(ydl)
+        ydl.params["logger"] = None
+        ydl.params["match_filter"] = None
+
+        evicted: List["YoutubeDL"] = []
+        with self._lock:
+            self._idle[(key, id(ydl))] = (ydl, time.monotonic())
+            while len(self._idle) > self.max_idle:
+                evicted.append(self._idle.popitem(last=False)[1][0])
+        for old in evicted:
+            self._close(old)
+
+    def _evict_expired(self, now: float):
+        # Called with the lock held
+        expired = [pool_key for pool_key, (_, since) in self._idle.items() if now - since > self.idle_timeout]
+        for pool_key in expired:
+            ydl, _ = self._idle.pop(pool_key)
+            self._close(ydl)
+
+    def _close(self, ydl: "YoutubeDL"):
+        try:
+            ydl.close()
+        except Exception as e:
+            self.logger.debug(f"Closing a YoutubeDL instance failed: {e}")
+
+    def close(self):
+        """Close every idle instance."""
+        with self._lock:
+            idle = [ydl for ydl, _ in self._idle.values()]
+            self._idle.clear()
+        for ydl in idle:
+            self._close(ydl)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
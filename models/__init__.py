@@ -1,7 +1,14 @@
 """Data models for the media downloader."""
 
 from .config import DownloadConfig
-from .enums import ContentType, QualityPreset
+from .enums import ContentType, DownloadStatus, JobState, QualityPreset
 from .plaform_info import PlatformInfo
+from .result import DownloadResult
+from .events import (DownloadEvent, DownloadStarted, DownloadProgress, PostProcessing,
+                     DownloadFinished, DownloadFailed)
 
-__all__: list[str] = ['ContentType', 'QualityPreset', 'DownloadConfig', 'PlatformInfo']
\ No newline at end of file
+__all__: list[str] = [
+    'ContentType', 'DownloadStatus', 'JobState', 'QualityPreset', 'DownloadConfig', 'PlatformInfo',
+    'DownloadResult', 'DownloadEvent', 'DownloadStarted', 'DownloadProgress', 'PostProcessing',
+    'DownloadFinished', 'DownloadFailed'
+]
\ No newline at end of file
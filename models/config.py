@@ -1,9 +1,14 @@
 """Configuration classes for the media downloader."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
 from .enums import QualityPreset
 
+if TYPE_CHECKING:
+    from ..core.sinks import MediaSink
+
 @dataclass
 class DownloadConfig:
     """Configuration for download operations."""
@@ -12,6 +17,13 @@ class DownloadConfig:
     quality: QualityPreset = QualityPreset.HD_1080P
     retries: int = 3
     fragment_retries: int = 3
+    # Entries of a playlist or channel downloaded at once, 1 keeps yt-dlp's sequential walk
+    playlist_workers: int = 1
+    # Fast local directory where files are downloaded and merged before moving to output_dir
+    scratch_dir: Optional[str] = None
+    # Streams media into the sink instead of writing files under output_dir
+    sink: Optional["MediaSink"] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
-        os.makedirs(self.output_dir, exist_ok=True)
\ No newline at end of file
+        if self.sink is None:
+            os.makedirs(self.output_dir, exist_ok=True)
\ No newline at end of file
@@ -12,4 +12,18 @@ class QualityPreset(Enum):
     WORST = "worst"
     HD_1080P = "bestvideo[height<=1080]+bestaudio/best[height<=1080]/best"
     HD_720P = "bestvideo[height<=720]+bestaudio/best[height<=720]/best"
-    SD_480P = "bestvideo[height<=480]+bestaudio/best[height<=480]/best"
\ No newline at end of file
+    SD_480P = "bestvideo[height<=480]+bestaudio/best[height<=480]/best"
+
+class DownloadStatus(Enum):
+    SUCCESS = "success"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    UNSUPPORTED = "unsupported"
+
+class JobState(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Download lifecycle events."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .enums import ContentType
+from .result import DownloadResult
+
+@dataclass
+class DownloadEvent:
+    """Base class for all download events."""
+    url: str
+
+@dataclass
+class DownloadStarted(DownloadEvent):
+    """The download was accepted and is about to start."""
+    platform: str
+    content_type: ContentType
+
+@dataclass
+class DownloadProgress(DownloadEvent):
+    """Bytes were received for a file."""
+    filename: str
+    downloaded_bytes: int
+    total_bytes: Optional[int] = None
+    speed: Optional[float] = None
+    eta: Optional[float] = None
+
+@dataclass
+class PostProcessing(DownloadEvent):
+    """A post-processor (merge, audio extraction, ...) changed state."""
+    postprocessor: str
+    status: str
+    filename: Optional[str] = None
+
+@dataclass
+class DownloadFinished(DownloadEvent):
+    """The download completed; ``result`` lists the files."""
+    result: DownloadResult
+
+@dataclass
+class DownloadFailed(DownloadEvent):
+    """The download failed or was cancelled."""
+    result: DownloadResult
\ No newline at end of file
@@ -1,8 +1,8 @@
 """Platform information model."""
 
 import re
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional, Pattern
 
 @dataclass
 class PlatformInfo:
@@ -10,9 +10,26 @@ class PlatformInfo:
     name: str
     hosts: List[str]
     patterns: List[str]
+    id_pattern: Optional[str] = None
+    host_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    compiled_patterns: List[Pattern] = field(init=False, repr=False, compare=False)
+    compiled_id_pattern: Optional[Pattern] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Normalise hosts and compile patterns once instead of on every lookup
+        self.host_set = frozenset(host.lower() for host in self.hosts)
+        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        self.compiled_id_pattern = re.compile(self.id_pattern) if self.id_pattern else None
 
     def matches_domain(self, domain: str) -> bool:
-        return domain.lower() in [host.lower() for host in self.hosts]
+        return domain.lower() in self.host_set
 
     def matches_pattern(self, url: str) -> bool:
-        return any(re.search(pattern, url, re.IGNORECASE) for pattern in self.patterns)
\ No newline at end of file
+        return any(pattern.search(url) for pattern in self.compiled_patterns)
+
+    def extract_id(self, url: str) -> Optional[str]:
+        """Extract the media id from a URL using ``id_pattern``."""
+        if not self.compiled_id_pattern:
+            return None
+        match = self.compiled_id_pattern.search(url)
+        return match.group("id") if match else None
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Result model for download operations."""
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from .enums import ContentType, DownloadStatus
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single URL."""
+    url: str
+    status: DownloadStatus
+    platform: Optional[str] = None
+    content_type: Optional[ContentType] = None
+    files: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    # Per-entry outcomes of a playlist or channel downloaded entry by entry
+    entries: List["DownloadResult"] = field(default_factory=list)
+    # (source file, future) pairs still running in the post-processing stage
+    postprocessing: List[Tuple[str, Any]] = field(default_factory=list, repr=False, compare=False)
+    # (scratch directory, output directory) when files are downloaded to a scratch directory first
+    staging: Optional[Tuple[str, str]] = field(default=None, repr=False, compare=False)
+    # (filename recorded so far or None, current filename, media id, preset) of files for the download archive
+    archived: List[Tuple[Optional[str], str, str, str]] = field(default_factory=list, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (DownloadStatus.SUCCESS, DownloadStatus.SKIPPED)
\ No newline at end of file
@@ -1,7 +1,6 @@
 """Instagram platform implementation."""
 
 import os
-from urllib.parse import urlparse
 
 from ..core.base import Platform
 from ..models import ContentType, DownloadConfig, PlatformInfo
@@ -15,18 +14,11 @@ class InstagramPlatform(Platform):
                 r"instagram\.com/p/[\w-]+",
                 r"instagram\.com/reel/[\w-]+",
                 r"instagram\.com/tv/[\w-]+"
-            ]
+            ],
+            id_pattern=r"instagram\.com/(?:p|reel|tv)/(?P<id>[\w-]+)"
         )
         super().__init__(info)
     
-    def validate_url(self, url: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            return (self.info.matches_domain(parsed.netloc) and 
-                   self.info.matches_pattern(url))
-        except Exception:
-            return False
-    
     def classify_content(self, url: str) -> ContentType:
         return ContentType.VIDEO
     
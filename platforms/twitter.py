@@ -1,7 +1,6 @@
 """Twitter/X platform implementation."""
 
 import os
-from urllib.parse import urlparse
 
 from ..core.base import Platform
 from ..models import ContentType, DownloadConfig, PlatformInfo
@@ -14,18 +13,11 @@ class TwitterPlatform(Platform):
             patterns=[
                 r"twitter\.com/\w+/status/\d+",
                 r"x\.com/\w+/status/\d+"
-            ]
+            ],
+            id_pattern=r"/status/(?P<id>\d+)"
         )
         super().__init__(info)
     
-    def validate_url(self, url: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            return (self.info.matches_domain(parsed.netloc) and 
-                   self.info.matches_pattern(url))
-        except Exception:
-            return False
-    
     def classify_content(self, url: str) -> ContentType:
         return ContentType.VIDEO
     
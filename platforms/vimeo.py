@@ -1,7 +1,6 @@
 """Vimeo platform implementation."""
 
 import os
-from urllib.parse import urlparse
 
 from ..core.base import Platform
 from ..models import ContentType, DownloadConfig, PlatformInfo
@@ -11,18 +10,11 @@ class VimeoPlatform(Platform):
         info = PlatformInfo(
             name="Vimeo",
             hosts=["vimeo.com", "www.vimeo.com"],
-            patterns=[r"vimeo\.com/\d+"]
+            patterns=[r"vimeo\.com/\d+"],
+            id_pattern=r"vimeo\.com/(?P<id>\d+)"
         )
         super().__init__(info)
     
-    def validate_url(self, url: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            return (self.info.matches_domain(parsed.netloc) and 
-                   self.info.matches_pattern(url))
-        except Exception:
-            return False
-    
     def classify_content(self, url: str) -> ContentType:
         return ContentType.VIDEO
     
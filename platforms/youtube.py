@@ -20,18 +20,11 @@ class YouTubePlatform(Platform):
                 r"youtube\.com/user/",
                 r"youtube\.com/shorts/",
                 r"youtu\.be/"
-            ]
+            ],
+            id_pattern=r"(?:[?&]v=|youtu\.be/|/shorts/)(?P<id>[\w-]{11})"
         )
         super().__init__(info)
     
-    def validate_url(self, url: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            return (self.info.matches_domain(parsed.netloc) and 
-                   self.info.matches_pattern(url))
-        except Exception:
-            return False
-    
     def classify_content(self, url: str) -> ContentType:
         parsed = urlparse(url)
         path = parsed.path or ""
@@ -0,0 +1,214 @@
+"""Local HTTP API for the long-running download service."""
+
+import dataclasses
+import json
+import logging
+import os
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .cli import get_quality_preset_mapping
+from .core.service import DownloadService
+from .models import DownloadConfig, JobState
+
+NDJSON = "application/x-ndjson"
+
+class DownloadServer:
+    """Serve a :class:`DownloadService` over HTTP on a local port.
+
+    Endpoints:
+
+    - ``POST /jobs`` with ``{"url": ...}`` or ``{"urls": [...]}`` and optional
+      ``output_dir``, ``quality``, ``audio_only`` and ``playlist_workers``;
+      ``output_dir`` must lie under the default output directory, and
+      requests with a URL no platform supports are rejected with 400
+    - ``GET /jobs[?state=running]``, ``GET /jobs/<id>``, ``DELETE /jobs/<id>``
+    - ``GET /events[?job=<id>]``, a stream of newline-delimited JSON events
+    - ``GET /health``
+
+    :meth:`run` blocks until SIGTERM or SIGINT, then stops accepting jobs,
+    lets the submitted ones finish and shuts down.
+    """
+
+    def __init__(self, service: DownloadService, defaults: DownloadConfig,
+                 host: str = "127.0.0.1", port: int = 8765):
+        self.service = service
+        self.defaults = defaults
+        self.logger = logging.getLogger("DownloadServer")
+        self._stop = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DownloadServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="service-http", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Serving the download API on {self.url}")
+        return self
+
+    def run(self, drain_timeout: Optional[float] = None) -> bool:
+        """Serve until SIGTERM or SIGINT, then drain. Returns False if jobs were cut short."""
+        previous = {sig: signal.signal(sig, lambda *args: self._stop.set())
+                    for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            if self._thread is None:
+                self.start()
+            # Waiting in short slices keeps the main thread responsive to signals
+            while not self._stop.wait(0.5):
+                pass
+            self.logger.info("Shutting down, waiting for submitted jobs")
+            return self.shutdown(drain_timeout)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def stop(self):
+        """Ask :meth:`run` to drain and return."""
+        self._stop.set()
+
+    def shutdown(self, drain_timeout: Optional[float] = None) -> bool:
+        """Drain the service, then stop serving. Returns False if the drain timed out."""
+        self._stop.set()
+        drained = self.service.drain(drain_timeout)
+        self.service.close(cancel=not drained)
+        self._server.shutdown()
+        self._server.server_close()
+        return drained
+
+    def config_for(self, request: Dict[str, Any]) -> DownloadConfig:
+        """Build a job's configuration from the defaults and the request's overrides."""
+        overrides = {}
+        if "output_dir" in request:
+            overrides["output_dir"] = self._output_dir(str(request["output_dir"]))
+        if "audio_only" in request:
+            overrides["audio_only"] = bool(request["audio_only"])
+        if "quality" in request:
+            quality_map = get_quality_preset_mapping()
+            if request["quality"] not in quality_map:
+                raise ValueError(f"quality must be one of {', '.join(quality_map)}")
+            overrides["quality"] = quality_map[request["quality"]]
+        if "playlist_workers" in request:
+            overrides["playlist_workers"] = max(1, int(request["playlist_workers"]))
+        return dataclasses.replace(self.defaults, **overrides)
+
+    def _output_dir(self, requested: str) -> str:
+        """Resolve a requested output directory, which must lie under the default one."""
+        root = os.path.realpath(self.defaults.output_dir)
+        # Relative paths are taken from the root; symlinks cannot lead out of it
+        path = os.path.realpath(os.path.join(root, requested))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"output_dir must be inside {self.defaults.output_dir}")
+        return path
+
+    def _handler_class(self):
+        server = self
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, data: Any):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self):
+                parts = urlsplit(self.path)
+                return [p for p in parts.path.split("/") if p], parse_qs(parts.query)
+
+            def do_GET(self):
+                path, query = self._route()
+                if path == ["health"]:
+                    counts = {state.value: len(service.jobs(state)) for state in JobState}
+                    self._send_json(200, {"status": "ok" if service.accepting else "draining", "jobs": counts})
+                elif path == ["jobs"]:
+                    try:
+                        state = JobState(query["state"][0]) if "state" in query else None
+                    except ValueError:
+                        self._send_json(400, {"error": f"Unknown state {query['state'][0]!r}"})
+                        return
+                    self._send_json(200, {"jobs": [job.to_dict() for job in service.jobs(state)]})
+                elif len(path) == 2 and path[0] == "jobs":
+                    job = service.get(path[1])
+                    if job is None:
+                        self._send_json(404, {"error": "Unknown job"})
+                    else:
+                        self._send_json(200, job.to_dict())
+                elif path == ["events"]:
+                    self._stream(query.get("job", [None])[0])
+                else:
+                    self._send_json(404, {"error": "Not found"})
+
+            def do_POST(self):
+                path, _ = self._route()
+                if path != ["jobs"]:
+                    self._send_json(404, {"error": "Not found"})
+                    return
+                if not service.accepting:
+                    self._send_json(503, {"error": "The service is shutting down"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    urls = request["urls"] if "urls" in request else [request["url"]]
+                    if not isinstance(urls, list) or not all(isinstance(url, str) and url.strip() for url in urls):
+                        raise ValueError("url must be a non-empty string and urls a list of them")
+                    config = server.config_for(request)
+                except (KeyError, TypeError, ValueError) as e:
+                    self._send_json(400, {"error": f"Invalid job request: {e}"})
+                    return
+                # Rejected up front, a job for them could only fail
+                unsupported = [url for url in urls if service.downloader.detect_platform(url) is None]
+                if unsupported:
+                    self._send_json(400, {"error": "Invalid or unsupported URL", "urls": unsupported})
+                    return
+                try:
+                    jobs = [service.submit(url, config) for url in urls]
+                except RuntimeError as e:
+                    self._send_json(503, {"error": str(e)})
+                    return
+                if "urls" in request:
+                    self._send_json(202, {"jobs": [job.to_dict() for job in jobs]})
+                else:
+                    self._send_json(202, jobs[0].to_dict())
+
+            def do_DELETE(self):
+                path, _ = self._route()
+                if len(path) != 2 or path[0] != "jobs":
+                    self._send_json(404, {"error": "Not found"})
+                    return
+                job = service.cancel(path[1])
+                if job is None:
+                    self._send_json(404, {"error": "Unknown job"})
+                else:
+                    self._send_json(200, job.to_dict())
+
+            def _stream(self, job_id: Optional[str]):
+                if job_id is not None and service.get(job_id) is None:
+                    self._send_json(404, {"error": "Unknown job"})
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", NDJSON)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    for event in service.subscribe(job_id):
+                        self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
@@ -1,37 +1,47 @@
-"""User interface components for the media downloader."""
+"""User interface components for the media downloader.
+
+Rich and Textual based interfaces are imported on first access, so
+importing this package (or a light submodule like ``ui.base``) stays
+cheap. The ``*_AVAILABLE`` flags only check that the dependencies are
+installed.
+"""
+
+import importlib
+import importlib.util
 
 from .base import UIManager
 from .basic_ui import BasicUIManager
+from .event_bus import UIEventBus
 
-# Try to import enhanced UIs
-try:
-    from .enhanced_ui import EnhancedRichUIManager
-    ENHANCED_UI_AVAILABLE = True
-except ImportError:
-    ENHANCED_UI_AVAILABLE = False
-
-try:
-    from .rich_ui import RichUIManager
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
-
-try:
-    from .textual_ui import MediaDownloaderApp, TEXTUAL_AVAILABLE
-except ImportError:
-    TEXTUAL_AVAILABLE = False
-
-# Determine the best available UI
-if ENHANCED_UI_AVAILABLE:
-    DefaultUIManager = EnhancedRichUIManager
-elif RICH_AVAILABLE:
-    DefaultUIManager = RichUIManager
-else:
-    DefaultUIManager = BasicUIManager
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+ENHANCED_UI_AVAILABLE = RICH_AVAILABLE
+TEXTUAL_AVAILABLE = importlib.util.find_spec("textual") is not None
+
+# Lazily imported names and the modules defining them
+_LAZY = {
+    'EnhancedRichUIManager': '.enhanced_ui',
+    'RichUIManager': '.rich_ui',
+    'MediaDownloaderApp': '.textual_ui',
+}
+
+def __getattr__(name):
+    if name == 'DefaultUIManager':
+        # Determine the best available UI
+        if ENHANCED_UI_AVAILABLE:
+            return __getattr__('EnhancedRichUIManager')
+        if RICH_AVAILABLE:
+            return __getattr__('RichUIManager')
+        return BasicUIManager
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'UIManager', 
     'BasicUIManager', 
+    'UIEventBus',
     'DefaultUIManager',
     'ENHANCED_UI_AVAILABLE',
     'RICH_AVAILABLE',
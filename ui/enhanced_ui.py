@@ -1,40 +1,18 @@
-"""Enhanced graphical UI implementation with Rich, Textual, and ASCII art."""
+"""Enhanced graphical UI implementation with Rich and ASCII art."""
 
-import asyncio
-import os
-from typing import Optional, List
+import importlib.util
+import time
 from rich.console import Console
 from rich.panel import Panel
-from rich.columns import Columns
 from rich.text import Text
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn, DownloadColumn, TransferSpeedColumn
-from rich.prompt import Prompt, Confirm, IntPrompt
+from rich.prompt import Prompt, Confirm
 from rich.align import Align
-from rich.layout import Layout
 from rich.live import Live
-from rich.tree import Tree
-from rich.markdown import Markdown
-from rich.syntax import Syntax
-from rich.rule import Rule
 from rich.box import ROUNDED, DOUBLE, HEAVY
-import time
-
-try:
-    from textual.app import App, ComposeResult
-    from textual.containers import Container, Horizontal, Vertical
-    from textual.widgets import Button, Header, Footer, Input, Select, Static, ProgressBar, Log
-    from textual.reactive import reactive
-    from textual.binding import Binding
-    TEXTUAL_AVAILABLE = True
-except ImportError:
-    TEXTUAL_AVAILABLE = False
 
-try:
-    from art import text2art, art
-    ART_AVAILABLE = True
-except ImportError:
-    ART_AVAILABLE = False
+# art is imported when the welcome screen is drawn
+ART_AVAILABLE = importlib.util.find_spec("art") is not None
 
 from .base import UIManager
 from ..models import DownloadConfig, QualityPreset, ContentType
@@ -53,6 +31,7 @@ class EnhancedRichUIManager(UIManager):
         
         # Create ASCII art title
         if ART_AVAILABLE:
+            from art import text2art
             title_art = text2art("MEDIA DL", font="block")
             subtitle_art = text2art("Multi-Platform Downloader", font="small")
         else:
@@ -0,0 +1,146 @@
+"""Background rendering of UI messages."""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+from .base import UIManager
+from ..models import DownloadConfig
+
+class UIEventBus(UIManager):
+    """Queue UI messages and render them on a separate thread.
+
+    Wraps another UI manager so that slow or animated output never holds
+    up the caller. Messages go onto a bounded queue consumed by a renderer
+    thread. When the renderer falls behind, queued messages of the
+    same kind are merged into one call, and when the queue is full the
+    oldest, least important message is dropped (errors are kept longest).
+
+    Prompts wait for the queue to drain and then run on the caller's
+    thread. Other attributes, such as ``console``, are taken from the
+    wrapped manager.
+    """
+
+    # Higher values are dropped last
+    PRIORITY = {"show_error": 2, "show_success": 1}
+    COALESCE = ("show_success", "show_error", "show_info")
+
+    def __init__(self, ui_manager: UIManager, max_pending: int = 256):
+        self.ui_manager = ui_manager
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.logger = logging.getLogger("UIEventBus")
+        self._events: Deque[Tuple[str, Tuple[Any, ...]]] = deque()
+        self._unreported = 0
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __getattr__(self, name):
+        # Only reached for attributes the bus doesn't define itself
+        return getattr(self.ui_manager, name)
+
+    def show_welcome(self):
+        self._publish("show_welcome")
+
+    def show_success(self, message: str):
+        self._publish("show_success", message)
+
+    def show_error(self, message: str):
+        self._publish("show_error", message)
+
+    def show_info(self, message: str):
+        self._publish("show_info", message)
+
+    def show_platform_detection(self, platform_name: str, content_type):
+        self._publish("show_platform_detection", platform_name, content_type)
+
+    def get_url_input(self) -> str:
+        self.flush()
+        return self.ui_manager.get_url_input()
+
+    def get_download_config(self) -> DownloadConfig:
+        self.flush()
+        return self.ui_manager.get_download_config()
+
+    def _publish(self, method: str, *args):
+        with self._cond:
+            if not self._closed:
+                if self._events and self._events[-1] == (method, args):
+                    # Repeating the message adds nothing
+                    return
+                if len(self._events) >= self.max_pending:
+                    self._drop_one()
+                self._events.append((method, args))
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="ui-render", daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+                return
+        # Closed: render on the caller's thread
+        self._render(method, args)
+
+    def _drop_one(self):
+        """Drop the oldest of the least important queued messages."""
+        index = min(range(len(self._events)), key=lambda i: self.PRIORITY.get(self._events[i][0], 0))
+        del self._events[index]
+        self.dropped += 1
+        self._unreported += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events and not self._closed:
+                    self._cond.wait()
+                if not self._events:
+                    return
+                method, args = self._events.popleft()
+                if method in self.COALESCE and self._events:
+                    # Behind: render every queued message of this kind in one call
+                    messages = [args[0]] + [a[0] for m, a in self._events if m == method]
+                    if len(messages) > 1:
+                        self._events = deque(event for event in self._events if event[0] != method)
+                        args = ("\n".join(messages),)
+                dropped, self._unreported = self._unreported, 0
+                self._busy = True
+
+            try:
+                if dropped:
+                    self.ui_manager.show_info(f"{dropped} message(s) skipped to keep up with downloads")
+                self._render(method, args)
+            except Exception as e:
+                self.logger.error(f"Rendering {method} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _render(self, method: str, args: Tuple[Any, ...]):
+        if method == "show_platform_detection" and not hasattr(self.ui_manager, method):
+            self.ui_manager.show_info(f"Detected platform: {args[0]}")
+            return
+        getattr(self.ui_manager, method)(*args)
+
+    def flush(self):
+        """Wait until every queued message has been rendered."""
+        with self._cond:
+            while self._events or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        """Render what is left and stop the renderer thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
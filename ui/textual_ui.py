@@ -1,6 +1,14 @@
 """Textual-based TUI application for advanced terminal interface."""
 
-from ui.enhanced_ui import TEXTUAL_AVAILABLE
+try:
+    from textual.app import App, ComposeResult
+    from textual.containers import Container, Horizontal, Vertical
+    from textual.widgets import Button, Header, Footer, Input, Select, Static, ProgressBar, Log
+    from textual.reactive import reactive
+    from textual.binding import Binding
+    TEXTUAL_AVAILABLE = True
+except ImportError:
+    TEXTUAL_AVAILABLE = False
 
 
 if TEXTUAL_AVAILABLE:
@@ -1,5 +1,8 @@
 """Utility functions for the media downloader."""
 
+from .files import move_files
+from .hashing import hash_file
 from .logging import setup_logging
+from .sources import iter_urls
 
-__all__ = ['setup_logging']
+__all__ = ['hash_file', 'move_files', 'setup_logging', 'iter_urls']
@@ -0,0 +1,87 @@
+"""Moving finished files into place without exposing partial ones."""
+
+import errno
+import os
+import shutil
+from typing import Iterable, List, Tuple
+
+# copy_file_range errors meaning "not between these files", not "the copy failed"
+_NO_KERNEL_COPY = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EBADF}
+
+def copy_file(source: str, target: str):
+    """Copy a file's contents inside the kernel where possible.
+
+    Uses ``copy_file_range`` (which can reflink or copy server-side on NFS),
+    falling back to :func:`shutil.copyfile`, which uses ``sendfile`` on
+    Linux.
+    """
+    if hasattr(os, "copy_file_range"):
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining <= 0:
+                    return
+            except OSError as e:
+                if e.errno not in _NO_KERNEL_COPY:
+                    raise
+    shutil.copyfile(source, target)
+
+def _fsync(path: str, directory: bool = False):
+    flags = os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        # Directories cannot be opened on Windows, where renames are durable anyway
+        if directory:
+            return
+        raise
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        if not (directory and e.errno in (errno.EINVAL, errno.EBADF)):
+            raise
+    finally:
+        os.close(fd)
+
+def move_files(moves: Iterable[Tuple[str, str]], durable: bool = True) -> List[str]:
+    """Move files to their targets, each appearing complete or not at all.
+
+    Files on the target's filesystem are renamed. Others are copied to a
+    hidden temporary name next to the target first, then renamed. With
+    ``durable`` the data is flushed before any rename and every target
+    directory once at the end, instead of a sync per file and step.
+    Returns the targets in order.
+    """
+    pending = []
+    for source, target in moves:
+        directory = os.path.dirname(os.path.abspath(target))
+        os.makedirs(directory, exist_ok=True)
+        if os.stat(source).st_dev == os.stat(directory).st_dev:
+            pending.append((source, target, None))
+        else:
+            tmp = os.path.join(directory, f".{os.path.basename(target)}.tmp")
+            copy_file(source, tmp)
+            pending.append((source, target, tmp))
+
+    if durable:
+        for source, _, tmp in pending:
+            _fsync(tmp or source)
+
+    directories = set()
+    for source, target, tmp in pending:
+        if tmp:
+            os.replace(tmp, target)
+            os.unlink(source)
+        else:
+            os.replace(source, target)
+        directories.add(os.path.dirname(os.path.abspath(target)))
+
+    if durable:
+        for directory in directories:
+            _fsync(directory, directory=True)
+    return [target for _, target, _ in pending]
@@ -0,0 +1,53 @@
+"""Content hashing of downloaded files."""
+
+import hashlib
+import mmap
+import os
+from typing import Any, Callable, Iterator, Optional
+
+# Large reads keep the syscall count low; the buffer is reused for every chunk
+CHUNK_SIZE = 1024 * 1024
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """Yield the contents of a file as views of at most ``chunk_size`` bytes.
+
+    Files larger than a chunk are memory-mapped, so hashing them copies
+    nothing into Python; smaller ones are read into a single buffer. The
+    views are only valid until the next one is yielded.
+    """
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > chunk_size:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Some filesystems (FUSE, network mounts) cannot be mapped
+                mapped = None
+            if mapped is not None:
+                with mapped, memoryview(mapped) as view:
+                    for offset in range(0, len(mapped), chunk_size):
+                        with view[offset:offset + chunk_size] as chunk:
+                            yield chunk
+                return
+        buffer = bytearray(chunk_size)
+        with memoryview(buffer) as view:
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                with view[:size] as chunk:
+                    yield chunk
+
+def hash_file(path: str, algorithm: str = "sha256", chunk_size: int = CHUNK_SIZE,
+              throttle: Optional[Callable[[int], Any]] = None) -> str:
+    """Return the hex digest of a file.
+
+    ``throttle`` is called with the size of every chunk before it is
+    hashed, e.g. ``TokenBucket.consume`` to bound the read rate.
+    """
+    digest = hashlib.new(algorithm)
+    for chunk in iter_chunks(path, chunk_size):
+        if throttle is not None:
+            throttle(len(chunk))
+        digest.update(chunk)
+    return digest.hexdigest()
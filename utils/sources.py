@@ -0,0 +1,34 @@
+"""Lazy readers for batch URL input."""
+
+import glob
+import logging
+import sys
+from typing import Iterable, Iterator
+
+logger = logging.getLogger("sources")
+
+def iter_lines(stream: Iterable[str]) -> Iterator[str]:
+    """Yield URLs from a line stream, skipping blank lines and comments."""
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        yield line
+
+def iter_urls(sources: Iterable[str]) -> Iterator[str]:
+    """Yield URLs from files, glob patterns or ``-`` (stdin), one per line.
+    
+    Files are opened one at a time and read line by line, so arbitrarily
+    large inputs and pipes are consumed as a stream.
+    """
+    for source in sources:
+        if source == "-":
+            yield from iter_lines(sys.stdin)
+            continue
+        
+        paths = sorted(glob.glob(source)) if glob.has_magic(source) else [source]
+        if not paths:
+            logger.warning(f"No input files match {source}")
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                yield from iter_lines(f)
\ No newline at end of file